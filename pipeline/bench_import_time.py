@@ -0,0 +1,84 @@
+# pipeline/bench_import_time.py
+# Cold-start import cost of each Python pipeline step, checked against a recorded budget.
+#
+#   python pipeline/bench_import_time.py            # check (exit 1 if a step is over budget)
+#   python pipeline/bench_import_time.py --record   # re-record budgets on the reference machine
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BUDGET_PATH = ROOT / "pipeline" / "import_time_budget.json"
+
+STEPS = [
+    "scripts/20_q1_choose_series.py",
+    "scripts/30_q2_var_estimation.py",
+    "scripts/40_q3_var_recursive_forecast.py",
+    "scripts/50_bonus_irf_granger.py",
+]
+
+# Load the step as a plain module: module-level imports run, main() does not.
+_LOADER = (
+    "import importlib.util, sys\n"
+    "spec = importlib.util.spec_from_file_location('step', sys.argv[1])\n"
+    "spec.loader.exec_module(importlib.util.module_from_spec(spec))\n"
+)
+
+
+def measure_import_ms(script: str) -> float:
+    """Total import time (sum of 'self' times from -X importtime) of one step, in ms."""
+    r = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _LOADER, str(ROOT / script)],
+        cwd=str(ROOT),
+        capture_output=True,
+        text=True,
+    )
+    if r.returncode != 0:
+        raise RuntimeError(f"Importing {script} failed:\n{r.stderr[-2000:]}")
+
+    total_us = 0
+    for line in r.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            total_us += int(fields[0].strip())
+    return total_us / 1000.0
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Check the import-time budget of the Python pipeline steps.")
+    ap.add_argument("--record", action="store_true", help="write the measured costs as the new budget")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per step (the minimum is kept)")
+    args = ap.parse_args()
+
+    measured = {s: min(measure_import_ms(s) for _ in range(max(1, args.repeat))) for s in STEPS}
+
+    if args.record:
+        budget = {"tolerance": 0.25, "steps_ms": {s: round(ms, 1) for s, ms in measured.items()}}
+        BUDGET_PATH.write_text(json.dumps(budget, indent=2) + "\n", encoding="utf-8")
+        for s, ms in measured.items():
+            print(f"{s}: {ms:.1f} ms (recorded)")
+        return
+
+    budget = json.loads(BUDGET_PATH.read_text(encoding="utf-8"))
+    tol = float(budget.get("tolerance", 0.25))
+    failed = []
+    for s, ms in measured.items():
+        limit = float(budget["steps_ms"][s]) * (1.0 + tol)
+        status = "ok" if ms <= limit else "OVER BUDGET"
+        print(f"{s}: {ms:.1f} ms (budget {limit:.1f} ms) {status}")
+        if ms > limit:
+            failed.append(s)
+
+    if failed:
+        raise SystemExit(f"Import-time regression in: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
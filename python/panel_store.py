@@ -0,0 +1,148 @@
+# python/panel_store.py
+# Memory-mapped, date-indexed panel of predictor series (one float matrix on disk)
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+_VALUES = "values.bin"
+_DATES = "dates.npy"
+_META = "meta.json"
+
+
+class PanelStore:
+    """
+    Read-only view of a panel store directory:
+      values.bin  float64/float32 matrix, column-major (each series is one contiguous run)
+      dates.npy   int64 date keys (datetime64[ns]), sorted and unique
+      meta.json   column names, dtype, shape
+
+    Single columns, contiguous column runs and date-range slices are zero-copy np.memmap views.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        meta = json.loads((self.path / _META).read_text(encoding="utf-8"))
+        self.columns: list[str] = list(meta["columns"])
+        self._col_index = {c: i for i, c in enumerate(self.columns)}
+        self._keys = np.load(self.path / _DATES, allow_pickle=False)
+        n_rows, n_cols = int(meta["n_rows"]), len(self.columns)
+        if n_cols == 0:
+            self.values = np.empty((n_rows, 0), dtype=meta["dtype"])
+        else:
+            self.values = np.memmap(self.path / _VALUES, dtype=meta["dtype"], mode="r", shape=(n_rows, n_cols), order="F")
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._col_index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[:, self._col_index[name]]
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self.values.shape
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self._keys.view("datetime64[ns]"))
+
+    def row_range(self, start=None, end=None) -> slice:
+        """Row slice for start <= date <= end (either bound optional)."""
+        lo = 0 if start is None else int(np.searchsorted(self._keys, _date_key(start), side="left"))
+        hi = len(self._keys) if end is None else int(np.searchsorted(self._keys, _date_key(end), side="right"))
+        return slice(lo, hi)
+
+    def view(self, cols: Optional[Sequence[str]] = None, start=None, end=None) -> np.ndarray:
+        """
+        (rows, cols) block for a date range. Zero-copy when cols is None or a contiguous run of
+        columns in store order; any other column set is gathered into a new array.
+        """
+        rows = self.row_range(start, end)
+        if cols is None:
+            return self.values[rows]
+        idx = [self._col_index[c] for c in cols]
+        if idx and idx == list(range(idx[0], idx[0] + len(idx))):
+            return self.values[rows, idx[0] : idx[0] + len(idx)]
+        return self.values[rows][:, idx]
+
+    def frame(self, cols: Sequence[str], date_col: str = "date", start=None, end=None) -> pd.DataFrame:
+        """Small DataFrame (date + cols) for code paths that need pandas, e.g. build_level_panel."""
+        rows = self.row_range(start, end)
+        missing = [c for c in cols if c not in self._col_index]
+        if missing:
+            raise ValueError(f"PanelStore: unknown columns {missing}.")
+        out = pd.DataFrame(np.asarray(self.view(cols, start, end), dtype=float), columns=list(cols))
+        out.insert(0, date_col, self.dates[rows])
+        return out
+
+    def iter_column_blocks(self, block_size: int = 1024, date_col: str = "date") -> Iterator[pd.DataFrame]:
+        """(date + up to block_size codes) blocks in store order, e.g. for q1_select_top_n_streaming."""
+        if block_size < 1:
+            raise ValueError("block_size must be >= 1.")
+        for start in range(0, len(self.columns), block_size):
+            yield self.frame(self.columns[start : start + block_size], date_col=date_col)
+
+
+def _date_key(value) -> np.int64:
+    return np.int64(pd.Timestamp(value).as_unit("ns").value)
+
+
+def write_panel_store(
+    source: pd.DataFrame | Iterable[pd.DataFrame],
+    path: str | Path,
+    date_col: str = "date",
+    dtype: str = "float64",
+) -> PanelStore:
+    """
+    Write a panel store from one DataFrame or from an iterable of (date + codes) column blocks
+    that all share the same date column. Blocks are appended column by column, so a panel wider
+    than memory can be converted block by block. Non-numeric cells become NaN.
+    """
+    if np.dtype(dtype) not in (np.dtype("float64"), np.dtype("float32")):
+        raise ValueError("write_panel_store: dtype must be float64 or float32.")
+    blocks = [source] if isinstance(source, pd.DataFrame) else source
+
+    out_dir = Path(path)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    columns: list[str] = []
+    keys = order = None
+
+    with open(out_dir / _VALUES, "wb") as fh:
+        for block in blocks:
+            if date_col not in block.columns:
+                raise ValueError(f"write_panel_store: block missing '{date_col}'.")
+            block_keys = pd.to_datetime(block[date_col], errors="coerce")
+            if block_keys.isna().any():
+                raise ValueError(f"Some values in '{date_col}' cannot be parsed as datetime.")
+            block_keys = block_keys.to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+            if keys is None:
+                order = np.argsort(block_keys, kind="stable")
+                keys = block_keys[order]
+                if np.any(np.diff(keys) == 0):
+                    raise ValueError("write_panel_store: duplicate dates.")
+            elif not np.array_equal(block_keys[order], keys):
+                raise ValueError("write_panel_store: all blocks must share the same dates.")
+
+            codes = [c for c in block.columns if c != date_col]
+            dup = set(codes).intersection(columns)
+            if dup:
+                raise ValueError(f"write_panel_store: duplicate columns {sorted(dup)}.")
+            if codes:
+                vals = block[codes].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=dtype)[order]
+                fh.write(np.ascontiguousarray(vals.T).tobytes())  # column-major on disk
+            columns.extend(str(c) for c in codes)
+
+    if keys is None:
+        raise ValueError("write_panel_store: no data.")
+    np.save(out_dir / _DATES, keys)
+    meta = {"columns": columns, "dtype": np.dtype(dtype).name, "n_rows": int(len(keys))}
+    (out_dir / _META).write_text(json.dumps(meta), encoding="utf-8")
+    return PanelStore(out_dir)
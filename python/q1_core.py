@@ -1,12 +1,17 @@
 # python/q1_core.py
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Sequence
+import hashlib
+import heapq
+from dataclasses import dataclass, replace
+from typing import Iterable, Iterator, Sequence
 
 import numpy as np
 import pandas as pd
 
+from python.panel_store import PanelStore
+from python.transforms import transform_block
+
 @dataclass(frozen=True)
 class Q1Config:
     date_col: str = "date"
@@ -55,7 +60,10 @@ def split_train_test_80_20_by_y(df: pd.DataFrame, y_col: str, train_ratio: float
 
 def first_difference(df: pd.DataFrame, cols: Sequence[str], lag: int) -> pd.DataFrame:
     out = df.copy()
-    out[list(cols)] = out[list(cols)].apply(pd.to_numeric, errors="coerce").diff(lag)
+    block = out[list(cols)]
+    if not all(pd.api.types.is_numeric_dtype(t) for t in block.dtypes):
+        block = block.apply(pd.to_numeric, errors="coerce")
+    out[list(cols)] = _diff_rows(block.to_numpy(dtype=float), lag)
     return out
 
 
@@ -70,28 +78,83 @@ def _corr_and_n(a: np.ndarray, b: np.ndarray) -> tuple[float, int]:
     return (r, n)
 
 
-def rank_by_abs_corr(df: pd.DataFrame, y_col: str, x_cols: list[str], top_n: int, min_obs: int) -> pd.DataFrame:
-    y = df[y_col].to_numpy(dtype=float)
+def masked_corr_with_y(y: np.ndarray, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pearson r and pairwise n_obs of every column of x against y, in one pass.
 
-    # functional style: map -> rows
-    rows = list(
-        map(
-            lambda c: {
-                "code": c,
-                "corr": _corr_and_n(y, df[c].to_numpy(dtype=float))[0],
-                "n_obs": _corr_and_n(y, df[c].to_numpy(dtype=float))[1],
-            },
-            x_cols,
-        )
-    )
-    out = pd.DataFrame(rows).dropna(subset=["corr"])
+    x is a 2-D float array (rows = time, cols = candidates); y is 1-D with the same rows.
+    Each column uses its own finite mask (finite y & finite x), exactly like _corr_and_n:
+    - n_obs < 3 -> corr NaN
+    - zero variance of y or x on the masked rows -> corr NaN
+    """
+    y = np.asarray(y, dtype=float).reshape(-1)
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x.reshape(-1, 1)
+    if x.shape[0] != y.shape[0]:
+        raise ValueError("masked_corr_with_y: x and y must have the same number of rows.")
+
+    mask = np.isfinite(x) & np.isfinite(y)[:, None]
+    n = mask.sum(axis=0)
+    n_safe = np.maximum(n, 1)
+
+    x0 = np.where(mask, x, 0.0)
+    y0 = np.where(mask, np.nan_to_num(y, nan=0.0, posinf=0.0, neginf=0.0)[:, None], 0.0)
+
+    # two-pass (centered) moments, same as np.std / np.corrcoef on the masked subset
+    xc = np.where(mask, x0 - x0.sum(axis=0) / n_safe, 0.0)
+    yc = np.where(mask, y0 - y0.sum(axis=0) / n_safe, 0.0)
+
+    sxx = np.einsum("ij,ij->j", xc, xc)
+    syy = np.einsum("ij,ij->j", yc, yc)
+    sxy = np.einsum("ij,ij->j", xc, yc)
+
+    ok = (n >= 3) & (sxx > 0) & (syy > 0)
+    corr = np.full(x.shape[1], np.nan)
+    corr[ok] = np.clip(sxy[ok] / np.sqrt(sxx[ok] * syy[ok]), -1.0, 1.0)
+    return corr, n.astype(int)
+
+
+def _rank_table(
+    codes: Sequence[str],
+    corr: np.ndarray,
+    n_obs: np.ndarray,
+    top_n: int,
+    min_obs: int,
+    extra: dict[str, np.ndarray] | None = None,
+) -> pd.DataFrame:
+    """Shared ranking rule: drop NaN corr, enforce min_obs, sort by (|corr|, n_obs) desc (stable)."""
+    out = pd.DataFrame({"code": list(codes), **(extra or {})})
+    out["corr"] = np.asarray(corr, dtype=float)
+    out["n_obs"] = np.asarray(n_obs, dtype=int)
+    out = out.dropna(subset=["corr"])
     out["abs_corr"] = out["corr"].abs()
     out = out[out["n_obs"] >= int(min_obs)]
     out = out.sort_values(["abs_corr", "n_obs"], ascending=[False, False]).head(int(top_n)).reset_index(drop=True)
     return out
 
 
-def q1_select_top5(y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> pd.DataFrame:
+def rank_by_abs_corr(df: pd.DataFrame, y_col: str, x_cols: list[str], top_n: int, min_obs: int) -> pd.DataFrame:
+    y = df[y_col].to_numpy(dtype=float)
+    x = df[list(x_cols)].to_numpy(dtype=float) if len(x_cols) else np.empty((len(df), 0))
+
+    corr, n_obs = masked_corr_with_y(y, x)
+    return _rank_table(x_cols, corr, n_obs, top_n=top_n, min_obs=min_obs)
+
+
+def _q1_train_diffs(y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> tuple[pd.DataFrame, list[str]]:
+    """align -> trim tail y -> train split -> first differences. Returns (diffed train, x codes)."""
+    merged = align_on_date(y_df, x_df, cfg.date_col)
+    merged = trim_to_last_observed_y(merged, cfg.y_col)
+
+    train_df, _ = split_train_test_80_20_by_y(merged, cfg.y_col, cfg.train_ratio)
+
+    x_cols = [c for c in train_df.columns if c not in [cfg.date_col, cfg.y_col]]
+    diffed = first_difference(train_df, [cfg.y_col] + x_cols, lag=cfg.diff_lag)
+    return diffed, x_cols
+
+
+def q1_select_top5(y_df: pd.DataFrame, x_df: pd.DataFrame | PanelStore, cfg: Q1Config) -> pd.DataFrame:
     """
     Pure end-to-end computation for Q1 data-driven candidates.
     - align by date
@@ -99,19 +162,548 @@ def q1_select_top5(y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> pd.
     - compute split (use train only)
     - difference (Δy and Δx)
     - rank by |corr|
+    x_df may be a PanelStore: it is then screened block by block (q1_select_top_n_streaming).
     """
-    merged = align_on_date(y_df, x_df, cfg.date_col)
-    merged = trim_to_last_observed_y(merged, cfg.y_col)
+    if isinstance(x_df, PanelStore):
+        return q1_select_top_n_streaming(y_df, x_df.iter_column_blocks(date_col=cfg.date_col), cfg)
 
-    train_df, _ = split_train_test_80_20_by_y(merged, cfg.y_col, cfg.train_ratio)
-
-    x_cols = [c for c in train_df.columns if c not in [cfg.date_col, cfg.y_col]]
-    diffed = first_difference(train_df, [cfg.y_col] + x_cols, lag=cfg.diff_lag)
+    diffed, x_cols = _q1_train_diffs(y_df, x_df, cfg)
 
     top5 = rank_by_abs_corr(diffed, y_col=cfg.y_col, x_cols=x_cols, top_n=cfg.top_n, min_obs=cfg.min_obs)
     return top5
 
 
+def _corr_from_sums(n, sx, sy, sxx, syy, sxy) -> np.ndarray:
+    """
+    Pearson r from pairwise-masked sums (n, Σx, Σy, Σx², Σy², Σxy), NaN where n < 3 or a variance is 0.
+    Inputs should be pre-centered (shifted) to limit cancellation.
+    """
+    n = np.asarray(n, dtype=float)
+    vx = n * sxx - sx * sx
+    vy = n * syy - sy * sy
+    cov = n * sxy - sx * sy
+
+    # round-off leaves ~1e-16 relative noise where the true variance is exactly zero
+    tol = 1e-10
+    ok = (n >= 3) & (vx > tol * n * sxx) & (vy > tol * n * syy)
+    corr = np.full(n.shape, np.nan)
+    corr[ok] = np.clip(cov[ok] / np.sqrt(vx[ok] * vy[ok]), -1.0, 1.0)
+    return corr
+
+
+def lead_lag_corr_fft(y: np.ndarray, x: np.ndarray, max_lag: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Cross-correlations corr(y[t], x[t - l]) for l = 0..max_lag and every column of x.
+
+    Returns (corr, n_obs), both shaped (max_lag + 1, n_cols). Lag l > 0 means x leads y by l rows.
+    Each (lag, column) pair uses its own pairwise finite mask; n_obs < 3 or zero variance -> NaN.
+    All masked moment sums are cross-correlations of masked series, computed as one batched
+    rFFT over the columns, so the cost is O(n log n) per series instead of O(n * L).
+    """
+    y = np.asarray(y, dtype=float).reshape(-1)
+    x = np.asarray(x, dtype=float)
+    if x.ndim == 1:
+        x = x.reshape(-1, 1)
+    n_rows = y.shape[0]
+    if x.shape[0] != n_rows:
+        raise ValueError("lead_lag_corr_fft: x and y must have the same number of rows.")
+    max_lag = int(max_lag)
+    if max_lag < 0 or max_lag >= n_rows:
+        raise ValueError("lead_lag_corr_fft: need 0 <= max_lag < number of rows.")
+
+    my = np.isfinite(y)
+    mx = np.isfinite(x)
+    # centering by the overall finite mean does not change r, but limits cancellation below
+    yv = np.where(my, y - (y[my].mean() if my.any() else 0.0), 0.0)
+    col_mean = np.where(mx, x, 0.0).sum(axis=0) / np.maximum(mx.sum(axis=0), 1)
+    xv = np.where(mx, x - col_mean, 0.0)
+
+    n_fft = 1 << int(np.ceil(np.log2(2 * n_rows)))
+
+    def fy(a: np.ndarray) -> np.ndarray:
+        return np.fft.rfft(a, n=n_fft)[:, None]
+
+    def fx(a: np.ndarray) -> np.ndarray:
+        return np.conj(np.fft.rfft(a, n=n_fft, axis=0))
+
+    def xcorr(fa: np.ndarray, fb: np.ndarray) -> np.ndarray:
+        # sum_t a[t] * b[t - l], l = 0..max_lag
+        return np.fft.irfft(fa * fb, n=n_fft, axis=0)[: max_lag + 1]
+
+    f_my, f_y, f_yy = fy(my.astype(float)), fy(yv), fy(yv * yv)
+    f_mx, f_x, f_xx = fx(mx.astype(float)), fx(xv), fx(xv * xv)
+
+    n = np.rint(xcorr(f_my, f_mx))
+    sy, syy = xcorr(f_y, f_mx), xcorr(f_yy, f_mx)
+    sx, sxx = xcorr(f_my, f_x), xcorr(f_my, f_xx)
+    sxy = xcorr(f_y, f_x)
+
+    return _corr_from_sums(n, sx, sy, sxx, syy, sxy), n.astype(int)
+
+
+def q1_select_top_n_lead_lag(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    cfg: Q1Config,
+    max_lag: int = 4,
+    min_lag: int = 1,
+) -> pd.DataFrame:
+    """
+    Rank candidates by their best LEADING cross-correlation with Δy (train window only).
+
+    For each Δx, the lag in min_lag..max_lag with the largest |corr(Δy_t, Δx_{t-lag})|
+    (n_obs >= min_obs) is kept; ties go to the shorter lag. min_lag=0 also allows lag 0.
+    Output columns: code, lag, corr, n_obs, abs_corr.
+    """
+    if not 0 <= int(min_lag) <= int(max_lag):
+        raise ValueError("q1_select_top_n_lead_lag: need 0 <= min_lag <= max_lag.")
+
+    diffed, x_cols = _q1_train_diffs(y_df, x_df, cfg)
+    y = diffed[cfg.y_col].to_numpy(dtype=float)
+    x = diffed[x_cols].to_numpy(dtype=float) if len(x_cols) else np.empty((len(diffed), 0))
+
+    corr, n_obs = lead_lag_corr_fft(y, x, max_lag=max_lag)
+    corr, n_obs = corr[int(min_lag) :], n_obs[int(min_lag) :]
+
+    score = np.where(np.isfinite(corr) & (n_obs >= int(cfg.min_obs)), np.abs(corr), -1.0)
+    best = np.argmax(score, axis=0)  # first max -> shortest lag
+    cols = np.arange(len(x_cols))
+    best_corr = np.where(score[best, cols] >= 0, corr[best, cols], np.nan)
+
+    return _rank_table(
+        x_cols,
+        best_corr,
+        n_obs[best, cols],
+        top_n=cfg.top_n,
+        min_obs=cfg.min_obs,
+        extra={"lag": best + int(min_lag)},
+    )
+
+
+def _diff_rows(values: np.ndarray, lag: int) -> np.ndarray:
+    """Row-wise difference of a 2-D block, NaN-padded at the top (same layout as DataFrame.diff)."""
+    if values.shape[0] <= lag:
+        return np.full(values.shape, np.nan)
+    return transform_block(values, "diff", lag, pad=True).values
+
+
+def _aligned_keys(y_df: pd.DataFrame, x_dates: pd.Series, cfg: Q1Config) -> pd.DataFrame:
+    """
+    Replay align_on_date -> trim_to_last_observed_y on the date keys only.
+    Returns (date, y, _pos) rows, where _pos is the row position in the x frame.
+    """
+    key = pd.DataFrame({cfg.date_col: x_dates.to_numpy(), "_pos": np.arange(len(x_dates))})
+    merged = align_on_date(y_df[[cfg.date_col, cfg.y_col]], key, cfg.date_col)
+    return trim_to_last_observed_y(merged, cfg.y_col)
+
+
+def _y_extra_codes(y_df: pd.DataFrame, cfg: Q1Config) -> list[str]:
+    """Non-date, non-y columns of the y sheet: candidates as well (q1_select_top5 merges the whole sheet)."""
+    return [c for c in y_df.columns if c not in (cfg.date_col, cfg.y_col)]
+
+
+def _y_extra_block(y_df: pd.DataFrame, x_dates: pd.Series, cfg: Q1Config) -> pd.DataFrame:
+    """The y sheet's extra series on the rows of an x block (date + codes, same layout as an x block)."""
+    key = pd.DataFrame({cfg.date_col: pd.to_datetime(x_dates).to_numpy()})
+    extra = to_datetime_strict(y_df[[cfg.date_col] + _y_extra_codes(y_df, cfg)], cfg.date_col)
+    return key.merge(extra, on=cfg.date_col, how="left")
+
+
+def _with_y_extra_block(y_df: pd.DataFrame, x_blocks: Iterable[pd.DataFrame], cfg: Q1Config) -> Iterator[pd.DataFrame]:
+    """x blocks preceded by the y sheet's extra series (merged order: y columns before x columns)."""
+    blocks = iter(x_blocks)
+    first = next(blocks, None)
+    if first is None:
+        return
+    if _y_extra_codes(y_df, cfg) and cfg.date_col in first.columns:
+        yield _y_extra_block(y_df, first[cfg.date_col], cfg)
+    yield first
+    yield from blocks
+
+
+def _train_rows_for_x_dates(y_df: pd.DataFrame, x_dates: pd.Series, cfg: Q1Config) -> tuple[np.ndarray, np.ndarray]:
+    """Returns (row positions into the x block for the train window, Δy on that window)."""
+    merged = _aligned_keys(y_df, x_dates, cfg)
+    train_df, _ = split_train_test_80_20_by_y(merged, cfg.y_col, cfg.train_ratio)
+
+    y_train = pd.to_numeric(train_df[cfg.y_col], errors="coerce").to_numpy(dtype=float)
+    dy = _diff_rows(y_train.reshape(-1, 1), cfg.diff_lag)[:, 0]
+    return train_df["_pos"].to_numpy(dtype=int), dy
+
+
+def q1_select_top_n_streaming(y_df: pd.DataFrame, x_blocks: Iterable[pd.DataFrame], cfg: Q1Config) -> pd.DataFrame:
+    """
+    Same result as q1_select_top5, but x arrives as column blocks (each block = date + some codes).
+    Extra series of y_df (besides date and y) are screened first, as in the merged DataFrame path.
+
+    Only one block and a bounded heap of cfg.top_n candidates are held at a time,
+    so peak memory depends on the block size, not on the panel width.
+    Ties keep the column order of the full panel (as the stable sort in rank_by_abs_corr).
+    """
+    if int(cfg.top_n) < 1:
+        raise ValueError("q1_select_top_n_streaming: top_n must be >= 1.")
+
+    heap: list[tuple[float, int, int, str, float]] = []
+    plan_dates = None
+    rows = dy = None
+    col_offset = 0
+
+    for block in _with_y_extra_block(y_df, x_blocks, cfg):
+        if cfg.date_col not in block.columns:
+            raise ValueError(f"q1_select_top_n_streaming: block missing '{cfg.date_col}'.")
+        codes = [c for c in block.columns if c not in (cfg.date_col, cfg.y_col)]
+
+        dates = to_datetime_strict(block[[cfg.date_col]], cfg.date_col)[cfg.date_col]
+        if plan_dates is None or not dates.equals(plan_dates):
+            rows, dy = _train_rows_for_x_dates(y_df, dates, cfg)
+            plan_dates = dates
+
+        if codes:
+            values = block[codes].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)[rows]
+            corr, n_obs = masked_corr_with_y(dy, _diff_rows(values, cfg.diff_lag))
+
+            keep = np.flatnonzero(np.isfinite(corr) & (n_obs >= int(cfg.min_obs)))
+            for j in keep:
+                item = (abs(float(corr[j])), int(n_obs[j]), -(col_offset + int(j)), codes[j], float(corr[j]))
+                if len(heap) < int(cfg.top_n):
+                    heapq.heappush(heap, item)
+                elif item[:3] > heap[0][:3]:
+                    heapq.heapreplace(heap, item)
+
+        col_offset += len(codes)
+
+    best = sorted(heap, key=lambda it: it[:3], reverse=True)
+    return _rank_table(
+        [it[3] for it in best],
+        np.array([it[4] for it in best], dtype=float),
+        np.array([it[1] for it in best], dtype=int),
+        top_n=cfg.top_n,
+        min_obs=cfg.min_obs,
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class Q1ScreenState:
+    """
+    Running pairwise-masked sums of (Δy - shift_y, Δx - shift_x) over the Q1 train window.
+    One entry per code; train_dates_hash fingerprints the window's dates and fingerprints holds one
+    checksum per LEVEL column [y, x...] of the window, so a revision is traced to the columns it touches.
+    """
+    codes: tuple[str, ...]
+    diff_lag: int
+    train_ratio: float
+    n_train: int
+    train_dates_hash: str
+    fingerprints: np.ndarray
+    shift: np.ndarray
+    n: np.ndarray
+    sx: np.ndarray
+    sy: np.ndarray
+    sxx: np.ndarray
+    syy: np.ndarray
+    sxy: np.ndarray
+
+
+def _dates_hash(dates: pd.Series) -> str:
+    keys = pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    return hashlib.sha1(keys.tobytes()).hexdigest()
+
+
+_FP_MULT = np.uint64(0x9E3779B97F4A7C15)  # odd, so every row weight is invertible mod 2**64
+
+
+def _column_fingerprints(levels: np.ndarray) -> np.ndarray:
+    """
+    Per-column Σ_r bits(v_rc) * M^(r+1) mod 2**64 over the float64 bit patterns (one NaN pattern).
+    Any single changed cell changes its column's value, and the first n rows alone give the
+    fingerprint of an n-row window.
+    """
+    canon = np.ascontiguousarray(np.where(np.isnan(levels), np.nan, levels), dtype=np.float64)
+    weights = np.cumprod(np.full(canon.shape[0], _FP_MULT, dtype=np.uint64))
+    return (canon.view(np.uint64) * weights[:, None]).sum(axis=0, dtype=np.uint64)
+
+
+def _screen_codes(y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> tuple[str, ...]:
+    """Candidate codes in merged order (y sheet extras first), as screened by q1_select_top5."""
+    x_codes = [c for c in x_df.columns if c not in (cfg.date_col, cfg.y_col)]
+    return tuple(_y_extra_codes(y_df, cfg) + x_codes)
+
+
+def _numeric_block(frame: pd.DataFrame) -> np.ndarray:
+    if all(pd.api.types.is_numeric_dtype(t) for t in frame.dtypes):
+        return frame.to_numpy(dtype=float)
+    return frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def _level_rows(rows: pd.DataFrame, y_df: pd.DataFrame, x_df: pd.DataFrame, codes: Sequence[str], cfg: Q1Config) -> np.ndarray:
+    """LEVEL block [y, codes...] for aligned key rows (touches only those rows of x_df)."""
+    extras = _y_extra_codes(y_df, cfg)
+    pos = rows["_pos"].to_numpy(dtype=int)
+    parts = [pd.to_numeric(rows[cfg.y_col], errors="coerce").to_numpy(dtype=float).reshape(-1, 1)]
+    if extras:
+        parts.append(_numeric_block(_y_extra_block(y_df, rows[cfg.date_col], cfg)[extras]))
+    parts.append(_numeric_block(x_df[list(codes[len(extras) :])].iloc[pos]).reshape(len(pos), -1))
+    return np.hstack(parts)
+
+
+def _masked_sums(diffs: np.ndarray, shift: np.ndarray) -> tuple[np.ndarray, ...]:
+    """(n, Σx, Σy, Σx², Σy², Σxy) per x column of a [Δy, Δx...] block, under the pairwise finite mask."""
+    v = diffs - shift
+    mask = np.isfinite(v[:, 1:]) & np.isfinite(v[:, :1])
+    x0 = np.where(mask, v[:, 1:], 0.0)
+    y0 = np.where(mask, v[:, :1], 0.0)
+    return (
+        mask.sum(axis=0),
+        x0.sum(axis=0),
+        y0.sum(axis=0),
+        np.einsum("ij,ij->j", x0, x0),
+        np.einsum("ij,ij->j", y0, y0),
+        np.einsum("ij,ij->j", x0, y0),
+    )
+
+
+def q1_screen_state_build(y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> Q1ScreenState:
+    """Full build of the incremental screening state (same window, candidates and differences as q1_select_top5)."""
+    dates = to_datetime_strict(x_df[[cfg.date_col]], cfg.date_col)[cfg.date_col]
+    merged = _aligned_keys(y_df, dates, cfg)
+    train_df, _ = split_train_test_80_20_by_y(merged, cfg.y_col, cfg.train_ratio)
+    if len(train_df) <= cfg.diff_lag:
+        raise ValueError("q1_screen_state_build: train window shorter than diff_lag.")
+
+    codes = _screen_codes(y_df, x_df, cfg)
+    levels = _level_rows(train_df, y_df, x_df, codes, cfg)
+    diffs = _diff_rows(levels, cfg.diff_lag)
+
+    finite = np.isfinite(diffs)
+    shift = np.where(finite, diffs, 0.0).sum(axis=0) / np.maximum(finite.sum(axis=0), 1)
+
+    n, sx, sy, sxx, syy, sxy = _masked_sums(diffs, shift)
+    return Q1ScreenState(
+        codes=codes,
+        diff_lag=int(cfg.diff_lag),
+        train_ratio=float(cfg.train_ratio),
+        n_train=len(train_df),
+        train_dates_hash=_dates_hash(train_df[cfg.date_col]),
+        fingerprints=_column_fingerprints(levels),
+        shift=shift,
+        n=n,
+        sx=sx,
+        sy=sy,
+        sxx=sxx,
+        syy=syy,
+        sxy=sxy,
+    )
+
+
+def _screen_plan(
+    state: Q1ScreenState, y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config
+) -> tuple[str | None, pd.DataFrame | None, np.ndarray | None, np.ndarray | None]:
+    """
+    Compare new data with the state. Returns (rebuild reason or None, new train key rows, their levels,
+    positions of the codes revised inside the old window).
+    Per-column fingerprints locate revised codes in one vectorised pass over the window; only those
+    codes are re-summed, every other code just adds the rows entering the window.
+    """
+    codes = _screen_codes(y_df, x_df, cfg)
+    if codes != state.codes:
+        return "candidate columns changed", None, None, None
+    if int(cfg.diff_lag) != state.diff_lag or float(cfg.train_ratio) != state.train_ratio:
+        return "diff_lag/train_ratio changed", None, None, None
+    if state.fingerprints.shape != (len(codes) + 1,):
+        return "state has no level fingerprints", None, None, None
+
+    dates = to_datetime_strict(x_df[[cfg.date_col]], cfg.date_col)[cfg.date_col]
+    merged = _aligned_keys(y_df, dates, cfg)
+    train_df, _ = split_train_test_80_20_by_y(merged, cfg.y_col, cfg.train_ratio)
+
+    if len(train_df) < state.n_train:
+        return "train/test split boundary moved backwards", None, None, None
+    if _dates_hash(train_df[cfg.date_col].iloc[: state.n_train]) != state.train_dates_hash:
+        return "dates inside the old train window changed", None, None, None
+
+    levels = _level_rows(train_df, y_df, x_df, codes, cfg)
+    changed = _column_fingerprints(levels[: state.n_train]) != state.fingerprints
+    if changed[0]:
+        return "y levels inside the old train window were revised", None, None, None
+    return None, train_df, levels, np.flatnonzero(changed[1:])
+
+
+def q1_screen_rebuild_reason(state: Q1ScreenState, y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> str | None:
+    """None if the state can be updated incrementally for this data, else a short reason for a full rebuild."""
+    return _screen_plan(state, y_df, x_df, cfg)[0]
+
+
+def _apply_plan(
+    state: Q1ScreenState, train_df: pd.DataFrame, levels: np.ndarray, revised: np.ndarray, date_col: str
+) -> Q1ScreenState:
+    lag = state.diff_lag
+    if len(train_df) == state.n_train and revised.size == 0:
+        return state
+
+    # differences of the entering rows only (rows n_train.. against their lag)
+    seg = levels[state.n_train - lag :]
+    add = _masked_sums(seg[lag:] - seg[:-lag], state.shift)
+    n, sx, sy, sxx, syy, sxy = (a + b for a, b in zip((state.n, state.sx, state.sy, state.sxx, state.syy, state.sxy), add))
+
+    if revised.size:
+        # revised codes: re-sum the whole new window for those columns only
+        cols = np.concatenate([[0], revised + 1])
+        redo = _masked_sums(_diff_rows(levels[:, cols], lag), state.shift[cols])
+        for acc, vals in zip((n, sx, sy, sxx, syy, sxy), redo):
+            acc[revised] = vals
+    return replace(
+        state,
+        n_train=len(train_df),
+        train_dates_hash=_dates_hash(train_df[date_col]),
+        fingerprints=_column_fingerprints(levels),
+        n=n,
+        sx=sx,
+        sy=sy,
+        sxx=sxx,
+        syy=syy,
+        sxy=sxy,
+    )
+
+
+def q1_screen_state_update(state: Q1ScreenState, y_df: pd.DataFrame, x_df: pd.DataFrame, cfg: Q1Config) -> Q1ScreenState:
+    """
+    Add the rows that entered the train window since the state was built (O(new rows x codes)) and
+    re-sum the codes whose old-window levels were revised (O(window x revised codes)).
+    Raises ValueError when a full rebuild is required (see q1_screen_rebuild_reason).
+    """
+    reason, train_df, levels, revised = _screen_plan(state, y_df, x_df, cfg)
+    if reason is not None:
+        raise ValueError(f"q1_screen_state_update: full rebuild required ({reason}).")
+    return _apply_plan(state, train_df, levels, revised, cfg.date_col)
+
+
+def q1_screen_top_n(state: Q1ScreenState, cfg: Q1Config) -> pd.DataFrame:
+    """Top-N table (same schema and ranking rule as q1_select_top5) from the running sums."""
+    corr = _corr_from_sums(state.n, state.sx, state.sy, state.sxx, state.syy, state.sxy)
+    return _rank_table(state.codes, corr, state.n, top_n=cfg.top_n, min_obs=cfg.min_obs)
+
+
+def q1_select_top_n_incremental(
+    state: Q1ScreenState | None,
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    cfg: Q1Config,
+) -> tuple[pd.DataFrame, Q1ScreenState]:
+    """Update the state if possible, rebuild it otherwise; returns (top-N table, new state)."""
+    reason = "no state" if state is None else None
+    if state is not None:
+        reason, train_df, levels, revised = _screen_plan(state, y_df, x_df, cfg)
+    if reason is None:
+        state = _apply_plan(state, train_df, levels, revised, cfg.date_col)
+    else:
+        state = q1_screen_state_build(y_df, x_df, cfg)
+    return q1_screen_top_n(state, cfg), state
+
+
+def block_bootstrap_indices(n_rows: int, n_boot: int, block_len: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Moving-block bootstrap row indices, shape (n_boot, n_rows).
+    Each replicate concatenates random blocks of block_len consecutive rows, truncated to n_rows.
+    """
+    n_rows, n_boot, block_len = int(n_rows), int(n_boot), int(block_len)
+    if n_boot < 1 or n_rows < 1:
+        raise ValueError("block_bootstrap_indices: n_rows and n_boot must be >= 1.")
+    if not 1 <= block_len <= n_rows:
+        raise ValueError("block_bootstrap_indices: need 1 <= block_len <= n_rows.")
+    n_blocks = -(-n_rows // block_len)
+    starts = rng.integers(0, n_rows - block_len + 1, size=(n_boot, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block_len)).reshape(n_boot, -1)
+    return idx[:, :n_rows]
+
+
+def bootstrap_corr_with_y(
+    y: np.ndarray,
+    x: np.ndarray,
+    idx: np.ndarray,
+    chunk_size: int = 256,
+) -> Iterable[tuple[np.ndarray, np.ndarray]]:
+    """
+    Yield (corr, n_obs), each (chunk, n_cols), for consecutive chunks of bootstrap replicates.
+
+    A replicate is a row-count vector w (how often each row was drawn), so all masked sums of a
+    chunk are matrix products W @ (masked moment block); memory is O(chunk_size x n_cols).
+    """
+    y = np.asarray(y, dtype=float).reshape(-1)
+    x = np.asarray(x, dtype=float)
+    n_rows = y.shape[0]
+    if x.shape[0] != n_rows:
+        raise ValueError("bootstrap_corr_with_y: x and y must have the same number of rows.")
+
+    mask = np.isfinite(x) & np.isfinite(y)[:, None]
+    m = mask.astype(float)
+    yv = np.where(np.isfinite(y), y - np.nanmean(y), 0.0)[:, None]
+    finite_x = np.isfinite(x)
+    xv = np.where(finite_x, x - np.where(finite_x, x, 0.0).sum(axis=0) / np.maximum(finite_x.sum(axis=0), 1), 0.0)
+    x0 = np.where(mask, xv, 0.0)
+    y0 = np.where(mask, yv, 0.0)
+    blocks = (m, x0, y0, x0 * x0, y0 * y0, x0 * y0)
+
+    for start in range(0, idx.shape[0], int(chunk_size)):
+        part = idx[start : start + int(chunk_size)]
+        n_rep = part.shape[0]
+        flat = (np.arange(n_rep)[:, None] * n_rows + part).reshape(-1)
+        w = np.bincount(flat, minlength=n_rep * n_rows).reshape(n_rep, n_rows).astype(float)
+
+        n, sx, sy, sxx, syy, sxy = (w @ b for b in blocks)
+        yield _corr_from_sums(n, sx, sy, sxx, syy, sxy), np.rint(n).astype(int)
+
+
+def q1_bootstrap_selection_frequency(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    cfg: Q1Config,
+    n_boot: int = 1000,
+    block_len: int = 4,
+    seed: int = 0,
+    chunk_size: int = 256,
+) -> pd.DataFrame:
+    """
+    How often each code makes the top-N under a moving-block bootstrap of the Q1 train window.
+
+    Rows with missing Δy are dropped first (they never enter a correlation). Within each replicate
+    candidates are ranked exactly like rank_by_abs_corr. Output columns (sorted by selection_freq):
+    code, selection_freq, top1_freq.
+    """
+    diffed, x_cols = _q1_train_diffs(y_df, x_df, cfg)
+    y = diffed[cfg.y_col].to_numpy(dtype=float)
+    keep = np.isfinite(y)
+    y = y[keep]
+    x = diffed[x_cols].to_numpy(dtype=float)[keep] if len(x_cols) else np.empty((int(keep.sum()), 0))
+
+    rng = np.random.default_rng(seed)
+    idx = block_bootstrap_indices(len(y), n_boot, min(int(block_len), len(y)), rng)
+
+    k = len(x_cols)
+    top_n = min(int(cfg.top_n), k)
+    if top_n < 1:
+        raise ValueError("q1_bootstrap_selection_frequency: need top_n >= 1 and at least one x column.")
+    in_top = np.zeros(k, dtype=np.int64)
+    top1 = np.zeros(k, dtype=np.int64)
+    col = np.broadcast_to(np.arange(k), (min(int(chunk_size), n_boot), k))
+
+    for corr, n_obs in bootstrap_corr_with_y(y, x, idx, chunk_size=chunk_size):
+        valid = np.isfinite(corr) & (n_obs >= int(cfg.min_obs))
+        score = np.where(valid, np.abs(corr), -1.0)
+        # same order as the stable sort on (abs_corr desc, n_obs desc), ties by column order
+        order = np.lexsort((col[: len(score)], -n_obs, -score), axis=-1)[:, :top_n]
+        chosen_valid = np.take_along_axis(valid, order, axis=1)
+
+        np.add.at(in_top, order[chosen_valid], 1)
+        np.add.at(top1, order[:, 0][chosen_valid[:, 0]], 1)
+
+    out = pd.DataFrame(
+        {
+            "code": x_cols,
+            "selection_freq": in_top / float(n_boot),
+            "top1_freq": top1 / float(n_boot),
+        }
+    )
+    return out.sort_values(["selection_freq", "top1_freq"], ascending=[False, False]).reset_index(drop=True)
 
 
 def _get_var_names(var_res) -> list[str]:
@@ -168,31 +760,18 @@ def compute_granger_table(
     kind: str = "f",
 ) -> pd.DataFrame:
     """
-    Pairwise Granger causality table for all ordered pairs in var_names (excluding self).
+    Pairwise Granger causality table for all ordered pairs in var_names (excluding self),
+    computed in one batched call (python.var_ols.var_granger_tests).
 
     Output columns:
-    - caused, causing, test_stat, p_value, df_num, df_denom
+    - caused, causing, kind, test_stat, p_value, df_num, df_denom
     """
+    from python.var_ols import var_granger_tests
+
     names = _get_var_names(var_res)
     for v in var_names:
         if v not in names:
             raise ValueError(f"{v} not found in VAR names: {names}")
 
-    rows: list[dict] = []
-    for caused in var_names:
-        for causing in var_names:
-            if causing == caused:
-                continue
-            test = var_res.test_causality(caused=caused, causing=[causing], kind=kind)
-            rows.append(
-                {
-                    "caused": caused,
-                    "causing": causing,
-                    "kind": kind,
-                    "test_stat": float(getattr(test, "test_statistic", np.nan)),
-                    "p_value": float(getattr(test, "pvalue", np.nan)),
-                    "df_num": float(getattr(test, "df_num", np.nan)) if getattr(test, "df_num", None) is not None else np.nan,
-                    "df_denom": float(getattr(test, "df_denom", np.nan)) if getattr(test, "df_denom", None) is not None else np.nan,
-                }
-            )
-    return pd.DataFrame(rows)
+    tests = [([caused], [causing]) for caused in var_names for causing in var_names if causing != caused]
+    return var_granger_tests(var_res, tests, kind=kind)
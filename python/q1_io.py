@@ -1,36 +1,132 @@
 # python/q1_io.py
 from __future__ import annotations
 
+import itertools
+import pickle
+import tempfile
+from dataclasses import fields
 from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
 import pandas as pd
 
+from python.q1_core import Q1ScreenState
+from python.workbook import WorkbookLike, open_workbook
 
-def read_x_strict_one_sheet(path: Path) -> pd.DataFrame:
-    xls = pd.ExcelFile(path)
-    if len(xls.sheet_names) != 1:
-        raise ValueError(
-            f"{path.name} must have exactly 1 sheet, but got {len(xls.sheet_names)}: {xls.sheet_names}"
-        )
-    return xls.parse(xls.sheet_names[0])
 
+def read_x_strict_one_sheet(path: WorkbookLike, cache_dir: Optional[Path] = None) -> pd.DataFrame:
+    with open_workbook(path, cache_dir) as book:
+        sheet_names = book.sheet_names
+        if len(sheet_names) != 1:
+            raise ValueError(
+                f"{book.path.name} must have exactly 1 sheet, but got {len(sheet_names)}: {sheet_names}"
+            )
+        return book.sheet(sheet_names[0])
 
-def read_y_sheet_strict(path: Path, sheet_name: str = "data_y") -> pd.DataFrame:
-    xls = pd.ExcelFile(path)
-    if sheet_name not in xls.sheet_names:
-        raise ValueError(f"{path.name} must contain sheet '{sheet_name}'. Available: {xls.sheet_names}")
-    return xls.parse(sheet_name)
 
+def read_y_sheet_strict(path: WorkbookLike, sheet_name: str = "data_y", cache_dir: Optional[Path] = None) -> pd.DataFrame:
+    with open_workbook(path, cache_dir) as book:
+        if sheet_name not in book.sheet_names:
+            raise ValueError(f"{book.path.name} must contain sheet '{sheet_name}'. Available: {book.sheet_names}")
+        return book.sheet(sheet_name)
 
-def read_desc_sheet_strict(path: Path, sheet_name: str = "descriptions") -> pd.DataFrame:
-    xls = pd.ExcelFile(path)
-    if sheet_name not in xls.sheet_names:
-        raise ValueError(f"{path.name} must contain sheet '{sheet_name}'. Available: {xls.sheet_names}")
-    df = xls.parse(sheet_name)
+
+def read_desc_sheet_strict(
+    path: WorkbookLike, sheet_name: str = "descriptions", cache_dir: Optional[Path] = None
+) -> pd.DataFrame:
+    with open_workbook(path, cache_dir) as book:
+        if sheet_name not in book.sheet_names:
+            raise ValueError(f"{book.path.name} must contain sheet '{sheet_name}'. Available: {book.sheet_names}")
+        df = book.sheet(sheet_name)
     if not {"CODE", "DESCRIPTION"}.issubset(df.columns):
         raise ValueError(f"Sheet '{sheet_name}' must contain CODE and DESCRIPTION. Got: {list(df.columns)}")
     return df[["CODE", "DESCRIPTION"]]
 
 
+def iter_csv_column_blocks(
+    path: Path,
+    date_col: str = "date",
+    block_size: int = 1000,
+    chunk_rows: Optional[int] = None,
+    cell_budget: int = 2_000_000,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield (date_col + up to block_size codes) column blocks of a wide CSV panel.
+    The file is tokenized once, in row chunks of chunk_rows rows (default: cell_budget // width).
+    A panel that fits in one chunk is split in memory; otherwise each chunk's blocks are appended
+    to per-block spill files (one file open at a time), which are then read back block by block.
+    Peak memory is about one row chunk or one column block, whatever the panel width.
+    """
+    if block_size < 1 or cell_budget < 1 or (chunk_rows is not None and chunk_rows < 1):
+        raise ValueError("iter_csv_column_blocks: block_size, chunk_rows and cell_budget must be >= 1.")
+    header = list(pd.read_csv(path, nrows=0).columns)
+    if date_col not in header:
+        raise ValueError(f"{Path(path).name} must contain column '{date_col}'. Got: {header[:10]}")
+    codes = [c for c in header if c != date_col]
+    blocks = [[date_col] + codes[start : start + block_size] for start in range(0, len(codes), block_size)]
+    if chunk_rows is None:
+        chunk_rows = max(1, cell_budget // len(header))
+
+    reader = pd.read_csv(path, chunksize=chunk_rows)
+    first = next(reader, None)
+    second = next(reader, None) if first is not None and len(first) == chunk_rows else None
+    if second is None:
+        for cols in blocks:
+            yield first[cols] if first is not None else pd.DataFrame(columns=cols)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="csv_blocks_") as tmp:
+        spills = [Path(tmp) / f"block_{b}.pkl" for b in range(len(blocks))]
+        chunks = itertools.chain([first, second], reader)
+        del first, second
+        for chunk in chunks:
+            for cols, spill in zip(blocks, spills):
+                with open(spill, "ab") as fh:
+                    pickle.dump(chunk[cols], fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+        for cols, spill in zip(blocks, spills):
+            parts = []
+            with open(spill, "rb") as fh:
+                while True:
+                    try:
+                        parts.append(pickle.load(fh))
+                    except EOFError:
+                        break
+            spill.unlink()
+            yield pd.concat(parts, ignore_index=True)
+
+
+def save_q1_screen_state(state: Q1ScreenState, out_path: Path) -> None:
+    """Persist the incremental screening state as one .npz file."""
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    arrays = {f.name: np.asarray(getattr(state, f.name)) for f in fields(Q1ScreenState)}
+    arrays["codes"] = np.asarray(state.codes, dtype=str)
+    with open(out_path, "wb") as fh:
+        np.savez(fh, **arrays)
+
+
+def load_q1_screen_state(path: Path) -> Q1ScreenState:
+    with np.load(path, allow_pickle=False) as z:
+        return Q1ScreenState(
+            codes=tuple(str(c) for c in z["codes"]),
+            diff_lag=int(z["diff_lag"]),
+            train_ratio=float(z["train_ratio"]),
+            n_train=int(z["n_train"]),
+            train_dates_hash=str(z["train_dates_hash"]),
+            # states saved before per-column fingerprints never match -> full rebuild
+            fingerprints=z["fingerprints"] if "fingerprints" in z.files else np.zeros(0, dtype=np.uint64),
+            shift=z["shift"],
+            n=z["n"],
+            sx=z["sx"],
+            sy=z["sy"],
+            sxx=z["sxx"],
+            syy=z["syy"],
+            sxy=z["sxy"],
+        )
+
+
 def require_columns(df: pd.DataFrame, required: list[str], context: str) -> None:
     missing = [c for c in required if c not in df.columns]
     if missing:
@@ -3,10 +3,11 @@ from __future__ import annotations
 
 from pathlib import Path
 import pandas as pd
-import matplotlib.pyplot as plt
 
 
 def save_top5_barh(top5: pd.DataFrame, out_path: Path, title: str = "Top 5 by |corr| (first differences)") -> None:
+    import matplotlib.pyplot as plt  # lazy: matplotlib is only needed when the figure is drawn
+
     plot_df = top5.sort_values("abs_corr", ascending=True)
 
     plt.figure(figsize=(10, 4))
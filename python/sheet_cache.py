@@ -0,0 +1,174 @@
+# python/sheet_cache.py
+# Columnar (.npz) cache for Excel sheets, keyed by workbook location + content hash + sheet name
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+_FORMAT_VERSION = 1
+
+
+def file_sha256(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(text))
+
+
+def _workbook_tag(xlsx_path: str | Path) -> str:
+    """File stem plus a short hash of the resolved path: same-named workbooks in other folders get their own entries."""
+    where = hashlib.sha256(str(Path(xlsx_path).resolve()).encode("utf-8")).hexdigest()[:12]
+    return f"{_slug(Path(xlsx_path).stem)}-{where}"
+
+
+def _entry_prefix(xlsx_path: str | Path, sheet_name: str) -> str:
+    return f"{_workbook_tag(xlsx_path)}--{_slug(sheet_name)}--"
+
+
+def cache_entry_path(cache_dir: str | Path, xlsx_path: str | Path, sheet_name: str, digest: str) -> Path:
+    return Path(cache_dir) / f"{_entry_prefix(xlsx_path, sheet_name)}{digest[:16]}.npz"
+
+
+def frame_to_npz(df: pd.DataFrame, out_path: str | Path) -> bool:
+    """
+    Store a DataFrame column by column (float/int/bool as-is, datetimes as int64 + unit, strings + null mask).
+    Returns False (and writes nothing) if a column cannot be stored losslessly.
+    """
+    if not isinstance(df.index, pd.RangeIndex) or not all(isinstance(c, str) for c in df.columns):
+        return False
+
+    arrays: dict[str, np.ndarray] = {}
+    cols_meta = []
+    for i, c in enumerate(df.columns):
+        s = df.iloc[:, i]
+        dtype = s.dtype
+        if pd.api.types.is_datetime64_dtype(dtype):
+            unit = np.datetime_data(dtype)[0]
+            arrays[f"c{i}"] = s.to_numpy().astype(np.int64)
+            kind = f"datetime64[{unit}]"
+        elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_float_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+            if isinstance(dtype, pd.api.extensions.ExtensionDtype):
+                return False
+            arrays[f"c{i}"] = s.to_numpy()
+            kind = str(dtype)
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            null = s.isna().to_numpy()
+            vals = s.to_numpy(dtype=object)
+            if not all(isinstance(v, str) for v in vals[~null]):
+                return False
+            arrays[f"c{i}"] = np.asarray(np.where(null, "", vals), dtype=str)
+            arrays[f"n{i}"] = null
+            kind = "str"
+        else:
+            return False
+        cols_meta.append({"name": c, "kind": kind, "dtype": str(dtype)})
+
+    meta = {"version": _FORMAT_VERSION, "nrows": len(df), "start": df.index.start, "columns": cols_meta}
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, __meta__=np.asarray(json.dumps(meta)), **arrays)
+    os.replace(tmp, out_path)
+    return True
+
+
+def frame_from_npz(path: str | Path) -> pd.DataFrame:
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["__meta__"]))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported sheet cache format in {Path(path).name}.")
+        data = {}
+        for i, col in enumerate(meta["columns"]):
+            raw = z[f"c{i}"]
+            kind = col["kind"]
+            if kind.startswith("datetime64"):
+                data[col["name"]] = pd.Series(raw.astype(kind))
+            elif kind == "str":
+                vals = raw.astype(object)
+                vals[z[f"n{i}"]] = np.nan
+                data[col["name"]] = pd.Series(vals, dtype=object).astype(col["dtype"])
+            else:
+                data[col["name"]] = pd.Series(raw)
+    index = pd.RangeIndex(meta["start"], meta["start"] + meta["nrows"])
+    out = pd.DataFrame(data)
+    out.index = index
+    return out
+
+
+def _prune_stale(cache_dir: Path, prefix: str, keep: Path) -> None:
+    for old in cache_dir.glob(f"{prefix}*"):
+        if old != keep:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+
+def read_sheet_cached(
+    xlsx_path: str | Path,
+    sheet_name: str,
+    parse: Callable[[], pd.DataFrame],
+    cache_dir: Optional[str | Path],
+    digest: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Return the sheet from the columnar cache, or call parse() and store the result.
+    Entries of the same workbook/sheet with another content hash are stale and get removed.
+    cache_dir=None disables caching.
+    """
+    if cache_dir is None:
+        return parse()
+
+    digest = digest or file_sha256(xlsx_path)
+    entry = cache_entry_path(cache_dir, xlsx_path, sheet_name, digest)
+    if entry.exists():
+        try:
+            return frame_from_npz(entry)
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable entry: re-parse and overwrite
+
+    df = parse()
+    if frame_to_npz(df, entry):
+        _prune_stale(Path(cache_dir), _entry_prefix(xlsx_path, sheet_name), keep=entry)
+    return df
+
+
+def sheet_names_cached(
+    xlsx_path: str | Path,
+    list_sheets: Callable[[], list[str]],
+    cache_dir: Optional[str | Path],
+    digest: Optional[str] = None,
+) -> list[str]:
+    """Sheet names of a workbook, cached next to the sheet entries (same content-hash key)."""
+    if cache_dir is None:
+        return list(list_sheets())
+
+    digest = digest or file_sha256(xlsx_path)
+    prefix = f"{_workbook_tag(xlsx_path)}--"
+    entry = Path(cache_dir) / f"{prefix}{digest[:16]}.sheets.json"
+    if entry.exists():
+        try:
+            return list(json.loads(entry.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            pass
+
+    names = list(list_sheets())
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    entry.write_text(json.dumps(names), encoding="utf-8")
+    for old in Path(cache_dir).glob(f"{prefix}*.sheets.json"):
+        if old != entry:
+            old.unlink(missing_ok=True)
+    return names
@@ -0,0 +1,86 @@
+# python/transforms.py
+# Batched level -> stationary transforms on whole 2-D blocks (shared by Q1 and VAR code paths)
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+TRANSFORM_KINDS = ("diff", "log_diff", "growth")
+
+
+@dataclass(frozen=True)
+class BlockTransform:
+    """
+    Output of transform_block.
+
+    Row r of values corresponds to LEVEL row level_offset + r:
+    - trimmed output (pad=False): level_offset = lag, values has n - lag rows
+    - padded output  (pad=True):  level_offset = 0, the first lag rows are NaN (DataFrame.diff layout)
+    """
+    values: np.ndarray
+    kind: str
+    lag: int
+    level_offset: int
+
+    def level_index(self, r: int | np.ndarray) -> int | np.ndarray:
+        return self.level_offset + r
+
+
+def transform_block(
+    levels: np.ndarray,
+    kind: str = "diff",
+    lag: int = 1,
+    pad: bool = False,
+    out: Optional[np.ndarray] = None,
+) -> BlockTransform:
+    """
+    Apply one transform to every column of a (rows, cols) level block in one NumPy operation.
+
+    kind:
+    - "diff":     x[t] - x[t-lag]            (lag=4 / lag=12: seasonal difference, quarterly / monthly)
+    - "log_diff": log x[t] - log x[t-lag]    (non-positive levels -> NaN)
+    - "growth":   x[t] / x[t-lag] - 1        (zero base -> NaN)
+
+    out, if given, is written in place and must have the output shape
+    ((rows - lag, cols), or (rows, cols) with pad=True). "diff" keeps integer dtypes
+    (unless pad=True); the other kinds are float64.
+    """
+    if kind not in TRANSFORM_KINDS:
+        raise ValueError(f"transform_block: kind must be one of {TRANSFORM_KINDS}.")
+    lag = int(lag)
+    if lag < 1:
+        raise ValueError("transform_block: lag must be >= 1.")
+
+    levels = np.asarray(levels)
+    if levels.ndim == 1:
+        levels = levels.reshape(-1, 1)
+    if levels.dtype.kind not in "iuf" or kind != "diff" or pad:
+        levels = levels.astype(float, copy=False)
+    n_rows, n_cols = levels.shape
+    if n_rows <= lag:
+        raise ValueError("transform_block: not enough rows for this lag.")
+
+    shape = (n_rows, n_cols) if pad else (n_rows - lag, n_cols)
+    if out is None:
+        out = np.empty(shape, dtype=levels.dtype if kind == "diff" else float)
+    elif out.shape != shape:
+        raise ValueError(f"transform_block: out must have shape {shape}, got {out.shape}.")
+
+    body = out[lag:] if pad else out
+    if pad:
+        out[:lag] = np.nan
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if kind == "diff":
+            np.subtract(levels[lag:], levels[:-lag], out=body)
+        elif kind == "log_diff":
+            logs = np.log(np.where(levels > 0, levels, np.nan))
+            np.subtract(logs[lag:], logs[:-lag], out=body)
+        else:
+            np.divide(levels[lag:], levels[:-lag], out=body)
+            body -= 1.0
+            body[~np.isfinite(body) & ~np.isnan(body)] = np.nan
+
+    return BlockTransform(values=out, kind=kind, lag=lag, level_offset=0 if pad else lag)
@@ -0,0 +1,149 @@
+# python/var_cache.py
+# Persistent cache of fitted VARs (compact VarFit state), keyed by training data + lag order + trend
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from python.var_ols import VarFit, fit_var_ols
+
+_FORMAT_VERSION = 1
+_ARRAYS = ("coef", "sigma_u", "xtx_inv", "resid")
+
+
+def var_fit_key(train: pd.DataFrame, p: int, trend: str) -> str:
+    """SHA-256 of the training matrix bytes, its column order and shape, p and trend."""
+    values = np.ascontiguousarray(train.to_numpy(dtype=np.float64))
+    head = {"v": _FORMAT_VERSION, "names": [str(c) for c in train.columns], "shape": values.shape, "p": int(p), "trend": trend}
+    h = hashlib.sha256(json.dumps(head, sort_keys=True).encode("utf-8"))
+    h.update(values.tobytes())
+    return h.hexdigest()
+
+
+def save_var_fit(fit: VarFit, out_path: str | Path) -> None:
+    meta = {"version": _FORMAT_VERSION, "names": list(fit.names), "trend": fit.trend, "k_ar": fit.k_ar, "nobs": fit.nobs}
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        np.savez(fh, __meta__=np.asarray(json.dumps(meta)), **{a: getattr(fit, a) for a in _ARRAYS})
+    os.replace(tmp, out_path)
+
+
+def load_var_fit(path: str | Path) -> VarFit:
+    with np.load(path, allow_pickle=False) as z:
+        meta = json.loads(str(z["__meta__"]))
+        if meta.get("version") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported VAR fit cache format in {Path(path).name}.")
+        arrays = {a: z[a] for a in _ARRAYS}
+    return VarFit(names=tuple(meta["names"]), trend=meta["trend"], k_ar=int(meta["k_ar"]), nobs=int(meta["nobs"]), **arrays)
+
+
+class VarFitCache:
+    """
+    Directory of <key>.npz VarFit entries with least-recently-used eviction by total size.
+    A hit refreshes the entry's mtime; after each store the oldest entries are removed until
+    the directory is under max_bytes (the entry just written is always kept).
+    """
+
+    def __init__(self, cache_dir: str | Path, max_bytes: int = 64 << 20) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = int(max_bytes)
+
+    def entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[VarFit]:
+        entry = self.entry_path(key)
+        if not entry.exists():
+            return None
+        try:
+            fit = load_var_fit(entry)
+            os.utime(entry)
+        except (OSError, ValueError, KeyError):
+            return None  # unreadable entry: caller refits and overwrites
+        return fit
+
+    def put(self, key: str, fit: VarFit) -> None:
+        entry = self.entry_path(key)
+        save_var_fit(fit, entry)
+        self.evict(keep=entry)
+
+    def evict(self, keep: Optional[Path] = None) -> None:
+        entries = []
+        for f in self.cache_dir.glob("*.npz"):
+            try:
+                st = f.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, f))
+        total = sum(size for _, size, _ in entries)
+        for _, size, f in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            if f == keep:
+                continue
+            f.unlink(missing_ok=True)
+            total -= size
+
+
+def fit_var_cached(train: pd.DataFrame, p: int, trend: str = "c", cache: Optional[VarFitCache] = None) -> VarFit:
+    """fit_var_ols(train, p, trend), served from / stored in cache when one is given."""
+    if cache is None:
+        return fit_var_ols(train, p, trend)
+    key = var_fit_key(train, p, trend)
+    fit = cache.get(key)
+    if fit is None:
+        fit = fit_var_ols(train, p, trend)
+        cache.put(key, fit)
+    return fit
+
+
+class FoldCheckpointStore:
+    """
+    Append-only JSON-lines file of finished backtest folds, one {"key": ..., "row": {...}} per line.
+    Each fold is flushed as soon as it is stored, so an interrupted run loses at most the fold in
+    progress; a torn last line is dropped on load. Floats round-trip exactly through JSON.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._rows: dict[str, dict] = {}
+        if self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        raw = self.path.read_bytes()
+        complete = raw[: raw.rfind(b"\n") + 1]
+        if len(complete) != len(raw):
+            with open(self.path, "r+b") as fh:  # drop a torn last line before appending
+                fh.truncate(len(complete))
+        for line in complete.decode("utf-8").splitlines():
+            try:
+                rec = json.loads(line)
+                self._rows[rec["key"]] = rec["row"]
+            except (ValueError, KeyError, TypeError):
+                continue
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self._rows.get(key)
+        return None if row is None else dict(row)
+
+    def put(self, key: str, row: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps({"key": key, "row": row}) + "\n")
+            fh.flush()
+        self._rows[key] = dict(row)
@@ -2,12 +2,36 @@
 # Pure functions for HW2 Section 2 & 3 (VAR)
 from __future__ import annotations
 
+import hashlib
+import itertools
+import json
+import os
+import time
 from dataclasses import dataclass
-from typing import List, Tuple, Dict, Optional
+from typing import Iterator, List, Tuple, Dict, Optional
 
 import numpy as np
 import pandas as pd
 
+from python.panel_store import PanelStore
+from python.transforms import transform_block
+from python.var_cache import FoldCheckpointStore, VarFitCache, fit_var_cached
+from python.var_ols import (
+    RecursiveVarOLS,
+    fit_var_ols_batch,
+    generalized_irf,
+    orth_irf_batch,
+    orth_irf_by_ordering,
+    simulate_var_bootstrap,
+    trend_order,
+    var_design,
+    var_fevd,
+    var_forecast_path,
+    var_granger_tests,
+    var_lag_search,
+    var_ma_matrices,
+)
+
 
 def compute_rmse(y_true: np.ndarray, y_pred: np.ndarray) -> float:
     if len(y_true) != len(y_pred):
@@ -56,7 +80,7 @@ def check_x_missing_only_last(df: pd.DataFrame, x_col: str, allow_last_missing:
 
 def build_level_panel(
     y_df: pd.DataFrame,
-    x_df: pd.DataFrame,
+    x_df: pd.DataFrame | PanelStore,
     date_col: str,
     y_col: str,
     x_col: str,
@@ -66,12 +90,18 @@ def build_level_panel(
     for c in need_y:
         if c not in y_df.columns:
             raise ValueError("build_level_panel: y_df missing columns.")
-    for c in need_x:
-        if c not in x_df.columns:
+    if isinstance(x_df, PanelStore):
+        # only the selected series is read from the memory-mapped store
+        if x_col not in x_df:
             raise ValueError("build_level_panel: x_df missing columns.")
+        x0 = x_df.frame([x_col], date_col=date_col)
+    else:
+        for c in need_x:
+            if c not in x_df.columns:
+                raise ValueError("build_level_panel: x_df missing columns.")
+        x0 = x_df[need_x].copy()
 
     y0 = y_df[need_y].copy()
-    x0 = x_df[need_x].copy()
 
     y0[date_col] = pd.to_datetime(y0[date_col]).dt.date
     x0[date_col] = pd.to_datetime(x0[date_col]).dt.date
@@ -83,7 +113,7 @@ def build_level_panel(
 
 def prepare_var_level_data(
     y_df: pd.DataFrame,
-    x_df: pd.DataFrame,
+    x_df: pd.DataFrame | PanelStore,
     date_col: str,
     y_col: str,
     x_col: str,
@@ -95,6 +125,101 @@ def prepare_var_level_data(
     return panel.reset_index(drop=True)
 
 
+@dataclass(frozen=True)
+class LevelPanel:
+    """
+    NumPy-backed level panel: values[:, 0] is y, values[:, 1:] are the x columns (names order).
+    date_keys are int64 day numbers (days since 1970-01-01).
+    """
+    date_keys: np.ndarray
+    names: Tuple[str, ...]
+    values: np.ndarray
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.names.index(name)]
+
+    def to_frame(self, date_col: str = "date") -> pd.DataFrame:
+        """Same layout as prepare_var_level_data (date column of datetime.date objects)."""
+        out = pd.DataFrame(self.values, columns=list(self.names))
+        out.insert(0, date_col, self.date_keys.astype("datetime64[D]").astype(object))
+        return out
+
+
+def _day_keys(dates) -> np.ndarray:
+    return pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+def prepare_var_level_panel(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame | PanelStore,
+    date_col: str,
+    y_col: str,
+    x_cols: List[str],
+    allow_last_x_missing: bool = True,
+) -> LevelPanel:
+    """
+    N-variable version of prepare_var_level_data in one vectorized pass:
+    y rows keep their dates, every x column is looked up on an int64 day key,
+    and the y-tail trim, the leading-complete cut and the x missing checks all come from one NaN mask.
+    """
+    if not x_cols:
+        raise ValueError("prepare_var_level_panel: x_cols is empty.")
+    for c in [date_col, y_col]:
+        if c not in y_df.columns:
+            raise ValueError("build_level_panel: y_df missing columns.")
+    if isinstance(x_df, PanelStore):
+        if any(c not in x_df for c in x_cols):
+            raise ValueError("build_level_panel: x_df missing columns.")
+        x_keys = _day_keys(x_df.dates)
+        x_vals = np.asarray(x_df.view(x_cols), dtype=float)
+    else:
+        if any(c not in x_df.columns for c in [date_col] + list(x_cols)):
+            raise ValueError("build_level_panel: x_df missing columns.")
+        x_keys = _day_keys(x_df[date_col])
+        x_vals = x_df[list(x_cols)].to_numpy(dtype=float)
+
+    y_keys = _day_keys(y_df[date_col])
+    order = np.argsort(y_keys, kind="stable")
+    y_keys = y_keys[order]
+    y_vals = y_df[y_col].to_numpy(dtype=float)[order]
+
+    x_order = np.argsort(x_keys, kind="stable")
+    x_sorted = x_keys[x_order]
+    if np.any(np.diff(x_sorted) == 0):
+        raise ValueError("prepare_var_level_panel: x_df has duplicate dates.")
+    pos = np.clip(np.searchsorted(x_sorted, y_keys), 0, max(len(x_sorted) - 1, 0))
+    hit = (x_sorted[pos] == y_keys) if len(x_sorted) else np.zeros(len(y_keys), dtype=bool)
+
+    values = np.full((len(y_keys), 1 + len(x_cols)), np.nan)
+    values[:, 0] = y_vals
+    values[hit, 1:] = x_vals[x_order[pos[hit]]]
+
+    na = np.isnan(values)
+    y_ok = np.flatnonzero(~na[:, 0])
+    if len(y_ok) == 0:
+        raise ValueError("trim_y_tail_na: y is all NA.")
+    last = int(y_ok[-1])
+    complete = np.flatnonzero(~na[: last + 1].any(axis=1))
+    if len(complete) == 0:
+        raise ValueError("drop_leading_complete_rows: all rows incomplete.")
+    first = int(complete[0])
+
+    x_na = na[first : last + 1, 1:]
+    bad_cols = x_na[:-1].any(axis=0) if allow_last_x_missing else x_na.any(axis=0)
+    if bad_cols.any():
+        j = int(np.flatnonzero(bad_cols)[0])
+        na_idx = (first + np.flatnonzero(x_na[:, j])).tolist()
+        raise ValueError(
+            f"x has missing values not only at the last observation. Missing idx: {na_idx} (column {x_cols[j]})"
+        )
+
+    return LevelPanel(
+        date_keys=y_keys[first : last + 1],
+        names=(y_col, *x_cols),
+        values=values[first : last + 1],
+    )
+
+
 def make_first_differences(
     level_df: pd.DataFrame,
     date_col: str,
@@ -109,11 +234,10 @@ def make_first_differences(
     if len(level_df) <= diff_lag:
         raise ValueError("make_first_differences: not enough rows.")
 
-    out = level_df.loc[diff_lag:, [date_col] + cols].copy().reset_index(drop=True)
-    for c in cols:
-        out[f"d_{c}"] = (
-            level_df[c].iloc[diff_lag:].to_numpy() - level_df[c].iloc[:-diff_lag].to_numpy()
-        )
+    # all columns differenced in one block op; diff row r <-> level row diff_lag + r
+    out = level_df.iloc[diff_lag:][[date_col] + cols].reset_index(drop=True)
+    diffs = transform_block(level_df[cols].to_numpy(), "diff", diff_lag)
+    out[[f"d_{c}" for c in cols]] = diffs.values
     return out
 
 
@@ -170,20 +294,51 @@ def make_var_lag_diagnostics(
     trend: str = "c",
     whiteness_lags: int = 12,
     alpha_sig: float = 0.05,
+    engine: str = "statsmodels",
+    common_sample: bool = False,
+    fit_cache: Optional[VarFitCache] = None,
 ) -> pd.DataFrame:
     """
     train_df columns must be ['dy','dx'].
-    """
-    from statsmodels.tsa.api import VAR
 
+    engine:
+    - "statsmodels": one VAR(df).fit(p) per lag order
+    - "fast": var_ols.var_lag_search (one max-lag design, nested Cholesky factors, no statsmodels)
+    common_sample (fast engine only): fit every p on the rows usable by max_lag (comparable IC).
+    The default False (same default as var_lag_search) keeps the per-p effective samples of
+    the statsmodels / R tables.
+    fit_cache (statsmodels engine): take each VAR(p) from / store it in a VarFitCache
+    (var_ols.fit_var_ols, identical estimates), so later stages reuse the fits.
+    """
     if not all(c in train_df.columns for c in ["dy", "dx"]):
         raise ValueError("make_var_lag_diagnostics: train_df must have columns ['dy','dx'].")
+    if engine not in ("statsmodels", "fast"):
+        raise ValueError("make_var_lag_diagnostics: engine must be 'statsmodels' or 'fast'.")
+
+    if engine == "fast":
+        diag = var_lag_search(
+            train_df[["dy", "dx"]].to_numpy(dtype=float),
+            max_lag=max_lag,
+            trend=trend,
+            whiteness_lags=whiteness_lags,
+            alpha_sig=alpha_sig,
+            common_sample=common_sample,
+        )
+        return diag.sort_values("p").reset_index(drop=True)
+    if common_sample:
+        raise ValueError("make_var_lag_diagnostics: common_sample needs engine='fast'.")
+
+    if fit_cache is None:
+        from statsmodels.tsa.api import VAR
 
-    model = VAR(train_df)
+        model = VAR(train_df)
 
     rows: List[Dict[str, object]] = []
     for p in range(1, max_lag + 1):
-        res = model.fit(p, trend=trend)
+        if fit_cache is None:
+            res = model.fit(p, trend=trend)
+        else:
+            res = fit_var_cached(train_df, p, trend, fit_cache)
 
         # IC
         aic = _safe_float(res.aic)
@@ -261,6 +416,92 @@ def choose_lag_from_diagnostics(diag_df: pd.DataFrame) -> int:
     return p_star
 
 
+def make_var_train_diffs(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    train_ratio: float = 0.8,
+    diff_lag: int = 1,
+) -> pd.DataFrame:
+    """First train_ratio share of the differenced (y, x) sample, columns ['dy','dx'] (Section 2 input)."""
+    panel = prepare_var_level_data(y_df, x_df, date_col, y_col, x_col, allow_last_x_missing=True)
+    diff_df = make_first_differences(panel, date_col, cols=[y_col, x_col], diff_lag=diff_lag)
+    n_train = int((train_ratio * len(diff_df)) // 1)
+    train = diff_df.iloc[:n_train][[f"d_{y_col}", f"d_{x_col}"]].reset_index(drop=True)
+    train.columns = ["dy", "dx"]
+    return train
+
+
+def _lag_diag_task(task: Tuple[str, str, np.ndarray, dict]) -> Tuple[str, str, pd.DataFrame, float]:
+    x_code, trend, train_values, kw = task
+    t0 = time.perf_counter()
+    diag = make_var_lag_diagnostics(pd.DataFrame(train_values, columns=["dy", "dx"]), trend=trend, **kw)
+    return x_code, trend, diag, time.perf_counter() - t0
+
+
+def make_var_lag_diagnostics_grid(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_codes: List[str],
+    trends: Tuple[str, ...] = ("n", "c", "ct"),
+    max_lag: int = 8,
+    whiteness_lags: int = 12,
+    alpha_sig: float = 0.05,
+    train_ratio: float = 0.8,
+    diff_lag: int = 1,
+    engine: str = "statsmodels",
+    n_jobs: int = 1,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    make_var_lag_diagnostics for every (x candidate, trend) pair.
+
+    The level data are read by the caller once; each candidate's training matrix is built here
+    and only that small array is shipped to the workers. n_jobs > 1 runs the pairs on a process
+    pool (n_jobs=-1: one worker per CPU); results are identical to n_jobs=1.
+
+    Returns (diag_long, choice):
+    - diag_long: x_code, trend, then the make_var_lag_diagnostics columns;
+      rows ordered by x_codes, then trends, then p
+    - choice: x_code, trend, p_star (choose_lag_from_diagnostics), seconds
+    """
+    if len(x_codes) == 0:
+        raise ValueError("make_var_lag_diagnostics_grid: x_codes is empty.")
+    if len(set(x_codes)) != len(x_codes):
+        raise ValueError("make_var_lag_diagnostics_grid: duplicate x_codes.")
+
+    kw = dict(max_lag=max_lag, whiteness_lags=whiteness_lags, alpha_sig=alpha_sig, engine=engine)
+    tasks = []
+    for code in x_codes:
+        train = make_var_train_diffs(y_df, x_df, date_col, y_col, code, train_ratio, diff_lag)
+        values = train.to_numpy(dtype=float)
+        tasks.extend((code, trend, values, kw) for trend in trends)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_jobs), len(tasks)))
+    if n_workers == 1:
+        results = [_lag_diag_task(t) for t in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_lag_diag_task, tasks))  # map keeps task order
+
+    long_parts, choice_rows = [], []
+    for code, trend, diag, seconds in results:
+        long_parts.append(diag.assign(x_code=code, trend=trend))
+        choice_rows.append(dict(x_code=code, trend=trend, p_star=choose_lag_from_diagnostics(diag), seconds=seconds))
+
+    diag_long = pd.concat(long_parts, ignore_index=True)
+    lead = ["x_code", "trend"]
+    diag_long = diag_long[lead + [c for c in diag_long.columns if c not in lead]]
+    return diag_long, pd.DataFrame(choice_rows)
+
+
 def extract_var_coef_table(res) -> pd.DataFrame:
     """
     Convert statsmodels VARResults params/pvalues to a long coefficient table.
@@ -295,11 +536,130 @@ def recursive_var_one_step_forecast_level(
     train_ratio: float = 0.8,
     diff_lag: int = 1,
     trend: str = "c",
+    engine: str = "statsmodels",
+    window: Optional[int] = None,
+    n_jobs: int = 1,
+    timing: bool = False,
+    n_boot: int = 0,
+    interval_levels: Tuple[float, ...] = (0.8, 0.95),
+    seed: int = 0,
+    checkpoint: Optional[FoldCheckpointStore] = None,
 ) -> pd.DataFrame:
     """
     Expanding-window one-step forecast on LEVEL y using VAR on differenced (dy, dx).
+    window: rolling mode instead; each fold is fit on the last `window` differenced
+    observations only (fewer while the sample is still shorter than window).
+
+    engine:
+    - "statsmodels": refit VAR(train).fit(p) at every fold
+    - "rls": one lagged design for the whole sample and a RecursiveVarOLS estimator that
+      absorbs one new observation per fold (rank-one update, no refit); same y_pred up to rounding.
+      In rolling mode the oldest observation is removed by a rank-one downdate.
+
+    n_jobs > 1 splits the folds into short contiguous chunks (about four per worker) that a
+    process pool hands out as workers free up, so the costlier late expanding-window folds
+    are spread out (n_jobs=-1: one worker per CPU); each worker receives the data once. Rows
+    come back in date order with exactly the same values as n_jobs=1. The rls engine always
+    runs serially: its folds form one rank-one update chain that is cheaper than shipping
+    estimator states to workers, so n_jobs is ignored there.
+    timing=True adds per-fold wall time (seconds) and the worker process id (worker).
+
+    n_boot > 0 adds residual-bootstrap prediction intervals: per fold, n_boot rows of the
+    fold's (centered) VAR residuals are drawn as one (n_boot, k) array and added to the
+    one-step forecast; columns lower_XX / upper_XX for each level in interval_levels
+    (see forecast_interval_coverage). Fold i draws from its own stream
+    SeedSequence(seed, spawn_key=(i,)), so intervals do not depend on n_jobs.
+
+    checkpoint: reuse / store fold results (see iter_recursive_var_one_step_forecasts);
+    needs n_jobs=1.
     """
-    from statsmodels.tsa.api import VAR
+    data, kw = _recursive_setup(
+        level_df, date_col, y_col, x_col, p, train_ratio, diff_lag, trend, engine, window, n_boot, interval_levels, seed
+    )
+    folds = data[3]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_workers = 1 if engine == "rls" else max(1, min(int(n_jobs), len(folds)))
+    if checkpoint is not None:
+        if n_workers > 1:
+            raise ValueError("recursive forecast: checkpoint needs n_jobs=1.")
+        rows = list(_iter_checkpointed_folds(level_df, date_col, y_col, x_col, data, kw, checkpoint))
+    elif n_workers == 1:
+        rows = list(_iter_forecast_folds(data, 0, len(folds), **kw))
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        size = -(-len(folds) // (4 * n_workers))
+        bounds = [(lo, min(lo + size, len(folds))) for lo in range(0, len(folds), size)]
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_fold_worker, initargs=(data,)) as pool:
+            parts = list(pool.map(_forecast_fold_chunk, [(lo, hi, kw) for lo, hi in bounds]))
+        rows = [row for part in parts for row in part]
+
+    out = pd.DataFrame(rows)
+    return out if timing else out.drop(columns=["seconds", "worker"])
+
+
+def iter_recursive_var_one_step_forecasts(
+    level_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    p: int,
+    train_ratio: float = 0.8,
+    diff_lag: int = 1,
+    trend: str = "c",
+    engine: str = "statsmodels",
+    window: Optional[int] = None,
+    n_boot: int = 0,
+    interval_levels: Tuple[float, ...] = (0.8, 0.95),
+    seed: int = 0,
+    checkpoint: Optional[FoldCheckpointStore] = None,
+) -> Iterator[Dict[str, object]]:
+    """
+    Stream the rows of recursive_var_one_step_forecast_level fold by fold (date order,
+    with seconds / worker).
+
+    With a checkpoint store, each finished fold is saved under a key made of a hash of the
+    level rows it depends on (rows 0..t: training prefix, base level and y_true), x code,
+    y column, p, trend and the other settings. Folds already in the store are yielded without
+    recomputation, so appending a quarter only computes the new folds, and an interrupted run
+    resumes where it stopped. Settings whose results depend on the fold layout (rls engine:
+    its first fold; bootstrap: the fold index of the RNG stream) are part of the key too, so
+    a reused row is always identical to a cold run.
+    """
+    data, kw = _recursive_setup(
+        level_df, date_col, y_col, x_col, p, train_ratio, diff_lag, trend, engine, window, n_boot, interval_levels, seed
+    )
+    if checkpoint is None:
+        yield from _iter_forecast_folds(data, 0, len(data[3]), **kw)
+    else:
+        yield from _iter_checkpointed_folds(level_df, date_col, y_col, x_col, data, kw, checkpoint)
+
+
+_FoldData = Tuple[np.ndarray, np.ndarray, np.ndarray, List[Tuple[int, int]]]
+
+
+def _recursive_setup(
+    level_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    p: int,
+    train_ratio: float,
+    diff_lag: int,
+    trend: str,
+    engine: str,
+    window: Optional[int],
+    n_boot: int,
+    interval_levels: Tuple[float, ...],
+    seed: int,
+) -> Tuple[_FoldData, dict]:
+    """Validated (data, settings) shared by the serial, pooled and checkpointed backtests."""
+    if engine not in ("statsmodels", "rls"):
+        raise ValueError("recursive forecast: engine must be 'statsmodels' or 'rls'.")
+    if not all(0 < a < 1 for a in interval_levels):
+        raise ValueError("recursive forecast: interval_levels must be in (0, 1).")
 
     n = len(level_df)
     n_train = int(np.floor(train_ratio * n))
@@ -310,20 +670,208 @@ def recursive_var_one_step_forecast_level(
     dy_col = f"d_{y_col}"
     dx_col = f"d_{x_col}"
 
-    mat_all = diff_df[[dy_col, dx_col]].copy()
-    mat_all.columns = ["dy", "dx"]
+    values = diff_df[[dy_col, dx_col]].to_numpy(dtype=float)
+    # a window of w diff rows leaves w - p regression rows for n_det + k*p regressors per equation
+    if window is not None and window - p <= trend_order(trend) + values.shape[1] * p:
+        raise ValueError("recursive forecast: window too short for this VAR(p).")
+
+    data = (
+        values,
+        level_df[y_col].to_numpy(),
+        level_df[date_col].to_numpy(),
+        folds,
+    )
+    kw = dict(
+        p=p,
+        diff_lag=diff_lag,
+        trend=trend,
+        engine=engine,
+        window=window,
+        n_boot=int(n_boot),
+        interval_levels=tuple(interval_levels),
+        seed=seed,
+    )
+    return data, kw
+
+
+def _fold_checkpoint_keys(
+    level_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    folds: List[Tuple[int, int]],
+    kw: dict,
+) -> List[str]:
+    """One key per fold: chained SHA-256 over level rows 0..t, plus settings (see iter_recursive_...)."""
+    settings = dict(kw, y_col=y_col, x_col=x_col, interval_levels=list(kw["interval_levels"]))
+    if kw["engine"] == "rls":
+        settings["first_fold"] = int(folds[0][0])
+    settings = json.dumps(settings, sort_keys=True).encode("utf-8")
+
+    dates = [str(d) for d in level_df[date_col].to_numpy()]
+    levels = level_df[[y_col, x_col]].to_numpy(dtype=np.float64)
+    chain, prefix = hashlib.sha256(), []
+    for r in range(len(levels)):
+        chain.update(dates[r].encode("utf-8") + levels[r].tobytes())
+        prefix.append(chain.copy().digest())
+
+    keys = []
+    for i, (t, _) in enumerate(folds):
+        h = hashlib.sha256(prefix[t] + settings)
+        if kw["n_boot"] > 0:
+            h.update(f"fold={i}".encode("utf-8"))
+        keys.append(h.hexdigest())
+    return keys
+
+
+def _iter_checkpointed_folds(
+    level_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    data: _FoldData,
+    kw: dict,
+    checkpoint: FoldCheckpointStore,
+) -> Iterator[Dict[str, object]]:
+    """Yield stored folds as-is; compute each run of missing folds in one pass and store it fold by fold."""
+    keys = _fold_checkpoint_keys(level_df, date_col, y_col, x_col, data[3], kw)
+    i = 0
+    while i < len(keys):
+        row = checkpoint.get(keys[i])
+        if row is not None:
+            yield row
+            i += 1
+            continue
+        hi = i
+        while hi < len(keys) and keys[hi] not in checkpoint:
+            hi += 1
+        for j, row in enumerate(_iter_forecast_folds(data, i, hi, **kw), start=i):
+            checkpoint.put(keys[j], row)
+            yield row
+        i = hi
+
+
+def _iter_forecast_folds(
+    data: _FoldData,
+    lo: int,
+    hi: int,
+    p: int,
+    diff_lag: int,
+    trend: str,
+    engine: str,
+    window: Optional[int],
+    n_boot: int = 0,
+    interval_levels: Tuple[float, ...] = (),
+    seed: int = 0,
+) -> Iterator[Dict[str, object]]:
+    """
+    Forecast rows (date, y_true, y_pred, [lower_XX, upper_XX,] seconds, worker) for folds[lo:hi].
+    The rls engine replays the (cheap) rank-one updates of folds[:lo] first, so a chunk's
+    estimates are bit-identical to the serial path.
+    """
+    values, y_level, dates, folds = data
+    with_resid = n_boot > 0
+    if engine == "rls":
+        dy_hats = _rls_one_step_dy(values, folds[:hi], p, diff_lag, trend, window, with_resid)
+        for _ in range(lo):
+            next(dy_hats)
+    else:
+        dy_hats = _refit_one_step_dy(values, folds[lo:hi], p, diff_lag, trend, window, with_resid)
+
+    probs = [q for a in interval_levels for q in ((1 - a) / 2, (1 + a) / 2)]
+    pid = os.getpid()
+    t0 = time.perf_counter()
+    for i, ((t, _), (dy_hat, resid)) in enumerate(zip(folds[lo:hi], dy_hats), start=lo):
+        row = dict(date=str(dates[t]), y_true=float(y_level[t]), y_pred=float(y_level[t - 1] + dy_hat))
+        if with_resid:
+            rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(i,)))
+            u = resid - resid.mean(axis=0)
+            draws = u[rng.integers(0, len(u), size=n_boot)]  # (n_boot, k) innovations
+            sims = y_level[t - 1] + dy_hat + draws[:, 0]
+            bounds = np.quantile(sims, probs)
+            for j, a in enumerate(interval_levels):
+                tag = _level_tag(a)
+                row[f"lower_{tag}"] = float(bounds[2 * j])
+                row[f"upper_{tag}"] = float(bounds[2 * j + 1])
+        t1 = time.perf_counter()
+        row.update(seconds=t1 - t0, worker=pid)
+        yield row
+        t0 = time.perf_counter()
+
+
+def _level_tag(level: float) -> str:
+    return f"{100 * level:g}".replace(".", "_")
+
+
+def forecast_interval_coverage(pred: pd.DataFrame) -> pd.DataFrame:
+    """
+    Empirical coverage of the lower_XX / upper_XX columns of a recursive forecast table.
+    Returns columns: level, n, coverage, mean_width.
+    """
+    rows = []
+    for col in pred.columns:
+        if not col.startswith("lower_"):
+            continue
+        tag = col[len("lower_") :]
+        if f"upper_{tag}" not in pred.columns:
+            raise ValueError(f"forecast_interval_coverage: missing upper_{tag}.")
+        y = pred["y_true"].to_numpy(dtype=float)
+        lo, hi = pred[col].to_numpy(dtype=float), pred[f"upper_{tag}"].to_numpy(dtype=float)
+        mask = np.isfinite(y) & np.isfinite(lo) & np.isfinite(hi)
+        if not np.any(mask):
+            raise ValueError("forecast_interval_coverage: no finite rows.")
+        rows.append(
+            dict(
+                level=float(tag.replace("_", ".")) / 100,
+                n=int(mask.sum()),
+                coverage=float(np.mean((y[mask] >= lo[mask]) & (y[mask] <= hi[mask]))),
+                mean_width=float(np.mean(hi[mask] - lo[mask])),
+            )
+        )
+    if not rows:
+        raise ValueError("forecast_interval_coverage: no interval columns (run with n_boot > 0).")
+    return pd.DataFrame(rows)
+
+
+_FOLD_DATA: Optional[_FoldData] = None
 
-    y_level = level_df[y_col].to_numpy()
-    dates = level_df[date_col].to_numpy()
 
-    out = []
+def _init_fold_worker(data: _FoldData) -> None:
+    global _FOLD_DATA
+    _FOLD_DATA = data
+
+
+def _forecast_fold_chunk(task: Tuple[int, int, dict]) -> List[Dict[str, object]]:
+    lo, hi, kw = task
+    return list(_iter_forecast_folds(_FOLD_DATA, lo, hi, **kw))
+
+
+def _window_start(end_diff_row: int, window: Optional[int]) -> int:
+    """First diff row of a fold's training matrix (0 for expanding windows)."""
+    return 0 if window is None else max(0, end_diff_row - int(window) + 1)
+
+
+def _refit_one_step_dy(
+    values: np.ndarray,
+    folds: List[Tuple[int, int]],
+    p: int,
+    diff_lag: int,
+    trend: str,
+    window: Optional[int] = None,
+    with_resid: bool = False,
+) -> Iterator[Tuple[float, Optional[np.ndarray]]]:
+    """(one-step dy forecast, residuals if with_resid) from a statsmodels refit per fold."""
+    from statsmodels.tsa.api import VAR
+
+    mat_all = pd.DataFrame(values, columns=["dy", "dx"])
     for (t, est_end) in folds:
         # need diffs up to est_end (= t-1)
         end_diff_row = est_end - diff_lag  # inclusive index in diff space
         if end_diff_row < (p + 2):
             raise ValueError("recursive forecast: not enough data for VAR fit.")
 
-        train_mat = mat_all.iloc[: end_diff_row + 1].copy()  # include end_diff_row
+        start = _window_start(end_diff_row, window)
+        train_mat = mat_all.iloc[start : end_diff_row + 1].copy()  # include end_diff_row
 
         model = VAR(train_mat)
         res = model.fit(p, trend=trend)
@@ -331,19 +879,237 @@ def recursive_var_one_step_forecast_level(
         # Forecast dy,dx one step ahead: need last p observations
         last_obs = train_mat.values[-p:]
         fc = res.forecast(y=last_obs, steps=1)[0]
-        dy_hat = float(fc[0])  # 'dy' is first column
+        yield float(fc[0]), (np.asarray(res.resid) if with_resid else None)  # 'dy' is first column
 
-        y_hat = float(y_level[t - 1] + dy_hat)
 
-        out.append(
-            dict(
-                date=str(dates[t]),
-                y_true=float(y_level[t]),
-                y_pred=y_hat,
-            )
-        )
+def _rls_one_step_dy(
+    values: np.ndarray,
+    folds: List[Tuple[int, int]],
+    p: int,
+    diff_lag: int,
+    trend: str,
+    window: Optional[int] = None,
+    with_resid: bool = False,
+) -> Iterator[Tuple[float, Optional[np.ndarray]]]:
+    """
+    (one-step dy forecast, residuals if with_resid) for consecutive folds (expanding, or
+    rolling when window is set).
+    Design row r of var_design is the VAR(p) regressor for diff row r (trend = r + 1, as a
+    statsmodels fit on diff rows 0..r-1), so the forecast for row end + 1 is z[end + 1] @ B.
+    """
+    z_all = var_design(values, p, trend)
+    for lo, end, coef in _rls_fold_coefs(z_all, values, folds, p, diff_lag, window):
+        resid = values[lo : end + 1] - z_all[lo : end + 1] @ coef if with_resid else None
+        yield float(z_all[end + 1] @ coef[:, 0]), resid
+
+
+def _rls_fold_coefs(
+    z_all: np.ndarray,
+    values: np.ndarray,
+    folds: List[Tuple[int, int]],
+    p: int,
+    diff_lag: int,
+    window: Optional[int] = None,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    (first regression row, end_diff_row, coefficients) per fold from one RecursiveVarOLS
+    (the array is updated in place by the next step; copy it to keep it).
+    A fold trained on diff rows start..end regresses rows start + p..end (its first p rows are
+    lags only). With a trend column the rolling fits differ from a per-window refit only by a
+    shift of the trend origin, which leaves the forecasts unchanged.
+    """
+    ends = [est_end - diff_lag for _, est_end in folds]
+    if ends[0] < (p + 2):
+        raise ValueError("recursive forecast: not enough data for VAR fit.")
+
+    lo = _window_start(ends[0], window) + p
+    fitter = RecursiveVarOLS(z_all[lo : ends[0] + 1], values[lo : ends[0] + 1])
+    for i, end in enumerate(ends):
+        if i > 0:
+            fitter.add(z_all[end], values[end])
+            new_lo = _window_start(end, window) + p
+            for r in range(lo, new_lo):
+                fitter.remove(z_all[r], values[r])
+            lo = new_lo
+        yield lo, end, fitter.coef
+
+
+def _refit_fold_coefs(
+    values: np.ndarray,
+    folds: List[Tuple[int, int]],
+    p: int,
+    diff_lag: int,
+    trend: str,
+    window: Optional[int] = None,
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    (start_diff_row, end_diff_row, statsmodels params) per fold, one VAR refit each.
+    The fit's trend column counts from start_diff_row (row start_diff_row -> 1).
+    """
+    from statsmodels.tsa.api import VAR
+
+    mat_all = pd.DataFrame(values, columns=["dy", "dx"])
+    for (_, est_end) in folds:
+        end_diff_row = est_end - diff_lag
+        if end_diff_row < (p + 2):
+            raise ValueError("recursive forecast: not enough data for VAR fit.")
+        start = _window_start(end_diff_row, window)
+        train_mat = mat_all.iloc[start : end_diff_row + 1]
+        yield start, end_diff_row, np.asarray(VAR(train_mat).fit(p, trend=trend).params)
 
-    return pd.DataFrame(out)
+
+def recursive_var_multi_horizon_forecast_level(
+    level_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_col: str,
+    p: int,
+    horizon: int = 8,
+    train_ratio: float = 0.8,
+    diff_lag: int = 1,
+    trend: str = "c",
+    engine: str = "rls",
+    window: Optional[int] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    h = 1..horizon LEVEL forecasts from every fold origin of the recursive backtest.
+
+    Each fold is estimated once (engine / window as in recursive_var_one_step_forecast_level);
+    its companion-matrix powers give the whole differenced path (var_forecast_path), which is
+    cumulated back to levels: y_hat[T+h] = y[T+h-diff_lag] + dy_hat(h), with forecasts standing
+    in for levels after T (for diff_lag=1: y[T] + cumulative dy_hat, T = t-1 as in the one-step
+    backtest). Targets past the end of the sample are skipped.
+
+    Returns (forecasts, rmse):
+    - forecasts: date, horizon, y_true, y_pred (date = target date; fold order, then horizon)
+    - rmse: horizon, n, rmse (compute_rmse per horizon)
+    """
+    if engine not in ("statsmodels", "rls"):
+        raise ValueError("multi-horizon forecast: engine must be 'statsmodels' or 'rls'.")
+    horizon = int(horizon)
+    if horizon < 1:
+        raise ValueError("multi-horizon forecast: horizon must be >= 1.")
+
+    n = len(level_df)
+    n_train = int(np.floor(train_ratio * n))
+    folds = make_expanding_folds_one_step(n, n_train)
+
+    diff_df = make_first_differences(level_df, date_col, [y_col, x_col], diff_lag=diff_lag)
+    values = diff_df[[f"d_{y_col}", f"d_{x_col}"]].to_numpy(dtype=float)
+    y_level = level_df[y_col].to_numpy(dtype=float)
+    dates = level_df[date_col].to_numpy()
+
+    if engine == "rls":
+        # RLS designs share one trend column over all rows (trend value of row r = r + 1)
+        rls = _rls_fold_coefs(var_design(values, p, trend), values, folds, p, diff_lag, window)
+        fold_coefs = ((0, end, coef) for _, end, coef in rls)
+    else:
+        fold_coefs = _refit_fold_coefs(values, folds, p, diff_lag, trend, window)
+
+    rows = []
+    for (t, _), (start, end, coef) in zip(folds, fold_coefs):
+        steps = min(horizon, n - t)
+        y_last = values[end - p + 1 : end + 1]
+        dy_path = var_forecast_path(coef, y_last, trend, steps, trend_start=end - start + 2)[:, 0]
+        y_hat = np.empty(steps)
+        for h in range(1, steps + 1):
+            base_h = h - diff_lag
+            base = y_level[t - 1 + base_h] if base_h <= 0 else y_hat[base_h - 1]
+            y_hat[h - 1] = base + dy_path[h - 1]
+            target = t - 1 + h
+            rows.append(dict(date=str(dates[target]), horizon=h, y_true=float(y_level[target]), y_pred=float(y_hat[h - 1])))
+
+    forecasts = pd.DataFrame(rows)
+    rmse = [
+        dict(horizon=h, n=len(g), rmse=compute_rmse(g["y_true"].to_numpy(), g["y_pred"].to_numpy()))
+        for h, g in forecasts.groupby("horizon", sort=True)
+    ]
+    return forecasts, pd.DataFrame(rmse)
+
+
+def var_grid_backtest(
+    y_df: pd.DataFrame,
+    x_df: pd.DataFrame,
+    date_col: str,
+    y_col: str,
+    x_codes: List[str],
+    max_lag: int = 8,
+    trends: Tuple[str, ...] = ("n", "c", "ct"),
+    train_ratio: float = 0.8,
+    diff_lag: int = 1,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Expanding-window one-step backtest (as recursive_var_one_step_forecast_level) for every
+    x candidate x p = 1..max_lag x trend, without refitting per cell.
+
+    Per candidate, one lagged design with all deterministic terms and max_lag lags is built
+    and cumulative sums of z z' and z y' are taken over its rows. The normal equations of any
+    (trend, p, fold) cell are then a sub-block difference of two cumulative sums (rows p..end),
+    and all folds of a cell are solved in one batched call.
+
+    Returns (leaderboard, paths):
+    - leaderboard: x_code, trend, p, n_folds, rmse, rank (sorted by rmse)
+    - paths: x_code, trend, p, date, y_true, y_pred
+    """
+    if len(x_codes) == 0:
+        raise ValueError("var_grid_backtest: x_codes is empty.")
+    max_lag = int(max_lag)
+    if max_lag < 1:
+        raise ValueError("var_grid_backtest: max_lag must be >= 1.")
+    for trend in trends:
+        trend_order(trend)
+
+    board, paths = [], []
+    for code in x_codes:
+        panel = prepare_var_level_data(y_df, x_df, date_col, y_col, code, allow_last_x_missing=True)
+        n = len(panel)
+        folds = make_expanding_folds_one_step(n, int(np.floor(train_ratio * n)))
+        ends = np.array([est_end - diff_lag for _, est_end in folds])
+
+        diff_df = make_first_differences(panel, date_col, [y_col, code], diff_lag=diff_lag)
+        values = diff_df[[f"d_{y_col}", f"d_{code}"]].to_numpy(dtype=float)
+        k, n_det_max = values.shape[1], trend_order("ct")
+        # first fold, largest cell: ends[0] - max_lag + 1 regression rows for n_det_max + k*max_lag regressors
+        if ends[0] - max_lag + 1 <= n_det_max + k * max_lag:
+            raise ValueError(f"var_grid_backtest: not enough data for VAR({max_lag}) with x={code}.")
+        y_level = panel[y_col].to_numpy(dtype=float)
+        dates = [str(d) for d in panel[date_col].to_numpy()]
+        t_idx = np.array([t for t, _ in folds])
+        y_true = y_level[t_idx]
+
+        z_all = var_design(values, max_lag, "ct")  # [const, trend, lag blocks]
+        finite = np.isfinite(values).all(axis=1) & np.isfinite(z_all).all(axis=1)
+        zz = np.where(finite[:, None, None], z_all[:, :, None] * z_all[:, None, :], 0.0)
+        zy = np.where(finite[:, None, None], z_all[:, :, None] * values[:, None, :], 0.0)
+        gram_cum = np.concatenate([np.zeros((1,) + zz.shape[1:]), np.cumsum(zz, axis=0)])
+        zy_cum = np.concatenate([np.zeros((1,) + zy.shape[1:]), np.cumsum(zy, axis=0)])
+
+        for trend in trends:
+            det = list(range(trend_order(trend)))
+            for p in range(1, max_lag + 1):
+                idx = np.array(det + list(range(n_det_max, n_det_max + k * p)))
+                gram = gram_cum[ends + 1][:, idx][:, :, idx] - gram_cum[p][idx][:, idx]
+                rhs = zy_cum[ends + 1][:, idx, 0] - zy_cum[p][idx, 0]
+                coef_dy = np.linalg.solve(gram, rhs[:, :, None])[:, :, 0]
+                y_pred = y_level[t_idx - 1] + np.einsum("fm,fm->f", z_all[ends + 1][:, idx], coef_dy)
+
+                board.append(dict(x_code=code, trend=trend, p=p, n_folds=len(folds), rmse=compute_rmse(y_true, y_pred)))
+                paths.append(
+                    pd.DataFrame(
+                        {
+                            "x_code": code,
+                            "trend": trend,
+                            "p": p,
+                            "date": [dates[t] for t in t_idx],
+                            "y_true": y_true,
+                            "y_pred": y_pred,
+                        }
+                    )
+                )
+
+    leaderboard = pd.DataFrame(board).sort_values("rmse", kind="stable").reset_index(drop=True)
+    leaderboard["rank"] = np.arange(1, len(leaderboard) + 1)
+    return leaderboard, pd.concat(paths, ignore_index=True)
 
 
 def _get_var_names(var_res) -> List[str]:
@@ -386,9 +1152,238 @@ def compute_orth_irf_table(var_res, impulse: str, response: str, steps: int = 12
     )
 
 
-def compute_granger_table(var_res, var_names: List[str], kind: str = "f") -> pd.DataFrame:
+def _fit_arrays(var_res) -> Tuple[np.ndarray, np.ndarray]:
+    """(coefs (p, k, k), sigma_u (k, k)) of a VarFit or statsmodels VARResults."""
+    return np.asarray(var_res.coefs, dtype=float), np.asarray(var_res.sigma_u, dtype=float)
+
+
+def compute_orth_irf_all(var_res, steps: int = 12, orderings=None) -> pd.DataFrame:
     """
-    Pairwise Granger causality tests for ordered pairs in var_names (excluding self).
+    Orthogonalized IRFs for every impulse x response pair and several Cholesky orderings,
+    from one set of MA matrices (companion recursion) and a permuted Sigma_u per ordering (no refits).
+
+    orderings: None -> the VAR column order only; "all" -> all k! permutations;
+    or a list of name sequences, e.g. [("dy", "dx"), ("dx", "dy")].
+    Returns columns: ordering ("dy,dx"), h, impulse, response, irf.
+    """
+    steps = int(steps)
+    if steps < 1:
+        raise ValueError("compute_orth_irf_all: steps must be >= 1.")
+
+    names = _get_var_names(var_res)
+    if orderings is None:
+        orderings = [tuple(names)]
+    elif isinstance(orderings, str):
+        if orderings != "all":
+            raise ValueError("compute_orth_irf_all: orderings must be None, 'all' or a list of name sequences.")
+        orderings = list(itertools.permutations(names))
+    for order in orderings:
+        if sorted(order) != sorted(names):
+            raise ValueError(f"compute_orth_irf_all: ordering {list(order)} is not a permutation of {names}")
+
+    coefs, sigma_u = _fit_arrays(var_res)
+    ma = var_ma_matrices(coefs, steps)
+
+    parts = []
+    for order in orderings:
+        irf = orth_irf_by_ordering(ma, sigma_u, [names.index(v) for v in order])
+        tidy = _tidy_h_response_impulse(names, irf=irf)
+        tidy.insert(0, "ordering", ",".join(order))
+        parts.append(tidy)
+    return pd.concat(parts, ignore_index=True)
+
+
+def _tidy_h_response_impulse(names: List[str], **arrays: np.ndarray) -> pd.DataFrame:
+    """Long h/impulse/response frame from (steps+1, k, k) arrays indexed [h, response, impulse]."""
+    n_h, k, _ = next(iter(arrays.values())).shape
+    name_arr = np.asarray(names, dtype=object)
+    out = pd.DataFrame(
+        {
+            "h": np.repeat(np.arange(n_h), k * k),
+            "impulse": name_arr[np.tile(np.arange(k), n_h * k)],
+            "response": name_arr[np.tile(np.repeat(np.arange(k), k), n_h)],
+        }
+    )
+    for col, arr in arrays.items():
+        out[col] = arr.reshape(-1)
+    return out
+
+
+def compute_girf_fevd_table(var_res, steps: int = 12) -> pd.DataFrame:
+    """
+    Ordering-invariant structural summary for every impulse x response pair, from one set of MA matrices:
+    girf (generalized Pesaran-Shin IRF, one-s.d. shock), fevd (generalized FEVD share, row-normalized)
+    and fevd_orth (Cholesky FEVD in the VAR column order, as statsmodels fevd).
+    fevd columns at h are shares of the (h+1)-step forecast-error variance of `response`.
+    Returns columns: h, impulse, response, girf, fevd, fevd_orth.
+    """
+    steps = int(steps)
+    if steps < 1:
+        raise ValueError("compute_girf_fevd_table: steps must be >= 1.")
+    coefs, sigma_u = _fit_arrays(var_res)
+    ma = var_ma_matrices(coefs, steps)
+    return _tidy_h_response_impulse(
+        _get_var_names(var_res),
+        girf=generalized_irf(ma, sigma_u),
+        fevd=var_fevd(ma, sigma_u, "generalized"),
+        fevd_orth=var_fevd(ma, sigma_u, "orth"),
+    )
+
+
+_IRF_BOOT: Optional[dict] = None
+
+
+def _init_irf_boot_worker(state: dict) -> None:
+    global _IRF_BOOT
+    _IRF_BOOT = state
+
+
+def _irf_boot_values(state: dict, chunk: int, n_rep: int) -> np.ndarray:
+    """(n_rep, cells) replicate orth IRFs of one chunk, drawn from stream SeedSequence(seed, spawn_key=(chunk,))."""
+    rng = np.random.default_rng(np.random.SeedSequence(state["seed"], spawn_key=(chunk,)))
+    y = simulate_var_bootstrap(state["coef"], state["y_init"], state["resid"], state["trend"], state["n_rows"], n_rep, rng)
+    coef, sigma_u = fit_var_ols_batch(y, state["p"], state["trend"])
+    irfs = [orth_irf_batch(coef, sigma_u, state["trend"], state["steps"], order) for order in state["orders"]]
+    return np.stack(irfs, axis=1).reshape(n_rep, -1)  # cell order = (ordering, h, response, impulse)
+
+
+def _histogram_counts(values: np.ndarray, lo: np.ndarray, width: np.ndarray, n_bins: int) -> np.ndarray:
+    """Per-cell counts over n_bins uniform bins plus an underflow (0) and overflow (n_bins + 1) bin."""
+    n_cells = values.shape[1]
+    j = np.floor((values - lo) / width) + 1
+    j = np.clip(np.nan_to_num(j, nan=n_bins + 1, posinf=n_bins + 1, neginf=0), 0, n_bins + 1).astype(np.int64)
+    flat = (np.arange(n_cells) * (n_bins + 2) + j).ravel()
+    return np.bincount(flat, minlength=n_cells * (n_bins + 2)).reshape(n_cells, n_bins + 2)
+
+
+def _irf_boot_chunk(task: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    chunk, n_rep = task
+    state = _IRF_BOOT
+    vals = _irf_boot_values(state, chunk, n_rep)
+    counts = _histogram_counts(vals, state["lo"], state["width"], state["n_bins"])
+    return counts, vals.min(axis=0), vals.max(axis=0)
+
+
+def _histogram_quantile(
+    counts: np.ndarray, vmin: np.ndarray, vmax: np.ndarray, lo: np.ndarray, width: np.ndarray, q: float
+) -> np.ndarray:
+    """Quantile q of each cell by linear interpolation of the binned CDF; the under/overflow bins span [min, lo] and [hi, max]."""
+    n_cells, n_slots = counts.shape
+    n_bins = n_slots - 2
+    edges = lo[:, None] + width[:, None] * np.arange(n_bins + 1)
+    left = np.column_stack([np.minimum(vmin, edges[:, 0]), edges])
+    right = np.column_stack([edges, np.maximum(vmax, edges[:, -1])])
+
+    cum = np.cumsum(counts, axis=1)
+    target = q * cum[:, -1]
+    j = np.argmax(cum >= target[:, None], axis=1)
+    rows = np.arange(n_cells)
+    below = np.where(j > 0, cum[rows, j - 1], 0)
+    frac = (target - below) / np.maximum(counts[rows, j], 1)
+    out = left[rows, j] + frac * (right[rows, j] - left[rows, j])
+    return np.clip(out, vmin, vmax)
+
+
+def bootstrap_orth_irf_bands(
+    var_res,
+    y_train: pd.DataFrame,
+    steps: int = 12,
+    orderings=None,
+    n_boot: int = 1000,
+    level: float = 0.95,
+    seed: int = 0,
+    n_jobs: int = 1,
+    chunk_size: int = 100,
+    n_bins: int = 2000,
+) -> pd.DataFrame:
+    """
+    Residual-bootstrap percentile bands for compute_orth_irf_all(var_res, steps, orderings).
+
+    Each replicate regenerates the training series (y_train, the data var_res was fitted on) from
+    the fitted coefficients and resampled centered residuals, refits by batched OLS
+    (fit_var_ols_batch) and recomputes the orth IRFs for every ordering. Replicates run in chunks
+    of chunk_size; chunk c draws from SeedSequence(seed, spawn_key=(c,)), so the bands do not
+    depend on n_jobs. Chunks are reduced into per-cell histograms (n_bins uniform bins over three
+    times the range of the first chunk, plus open-ended tails), so memory does not grow with n_boot.
+
+    Returns the compute_orth_irf_all columns plus lower, upper (equal-tailed, coverage = level).
+    """
+    n_boot, chunk_size, n_bins = int(n_boot), int(chunk_size), int(n_bins)
+    if n_boot < 1 or chunk_size < 1 or n_bins < 1:
+        raise ValueError("bootstrap_orth_irf_bands: n_boot, chunk_size and n_bins must be >= 1.")
+    if not 0.0 < level < 1.0:
+        raise ValueError("bootstrap_orth_irf_bands: level must be in (0, 1).")
+
+    point = compute_orth_irf_all(var_res, steps=steps, orderings=orderings)
+    names = _get_var_names(var_res)
+    y = y_train[names].to_numpy(dtype=float) if isinstance(y_train, pd.DataFrame) else np.asarray(y_train, dtype=float)
+    p = int(var_res.k_ar)
+    if y.shape != (int(var_res.nobs) + p, len(names)):
+        raise ValueError("bootstrap_orth_irf_bands: y_train does not match the sample var_res was fitted on.")
+
+    state = {
+        "coef": np.asarray(var_res.params, dtype=float),
+        "y_init": y[:p],
+        "resid": np.asarray(var_res.resid, dtype=float),
+        "trend": var_res.trend,
+        "n_rows": len(y),
+        "p": p,
+        "steps": int(steps),
+        "orders": [[names.index(v) for v in order.split(",")] for order in point["ordering"].unique()],
+        "seed": seed,
+        "n_bins": n_bins,
+    }
+    sizes = [min(chunk_size, n_boot - s) for s in range(0, n_boot, chunk_size)]
+
+    # The first chunk fixes the bin grid of every cell
+    first = _irf_boot_values(state, 0, sizes[0])
+    vmin, vmax = first.min(axis=0), first.max(axis=0)
+    span = np.maximum(vmax - vmin, 1e-12 * np.maximum(np.abs(vmin), 1.0))
+    state["lo"] = vmin - span
+    state["width"] = 3.0 * span / n_bins
+    counts = _histogram_counts(first, state["lo"], state["width"], n_bins)
+    del first
+
+    def absorb(part) -> None:
+        nonlocal counts, vmin, vmax
+        counts += part[0]
+        vmin = np.minimum(vmin, part[1])
+        vmax = np.maximum(vmax, part[2])
+
+    tasks = [(c, n) for c, n in enumerate(sizes)][1:]
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_workers = max(1, min(int(n_jobs), len(tasks)))
+    if n_workers == 1:
+        _init_irf_boot_worker(state)
+        for task in tasks:
+            absorb(_irf_boot_chunk(task))
+    else:
+        from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+        todo = iter(tasks)
+        with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_irf_boot_worker, initargs=(state,)) as pool:
+            pending = {pool.submit(_irf_boot_chunk, t) for t in itertools.islice(todo, 2 * n_workers)}
+            while pending:  # bounded number of chunks in flight
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    absorb(fut.result())
+                pending |= {pool.submit(_irf_boot_chunk, t) for t in itertools.islice(todo, len(done))}
+
+    alpha = (1.0 - level) / 2.0
+    out = point.copy()
+    out["lower"] = _histogram_quantile(counts, vmin, vmax, state["lo"], state["width"], alpha)
+    out["upper"] = _histogram_quantile(counts, vmin, vmax, state["lo"], state["width"], 1.0 - alpha)
+    return out
+
+
+def compute_granger_table(
+    var_res, var_names: List[str], kind: str = "f", block_exogeneity: bool = False
+) -> pd.DataFrame:
+    """
+    Pairwise Granger causality tests for ordered pairs in var_names (excluding self), all from one
+    coefficient covariance (var_granger_tests). block_exogeneity=True appends, per caused variable,
+    the joint test that all other var_names do not cause it (causing is then comma-joined).
     Output columns: caused, causing, kind, test_stat, p_value, df_num, df_denom.
     """
     names = _get_var_names(var_res)
@@ -396,27 +1391,7 @@ def compute_granger_table(var_res, var_names: List[str], kind: str = "f") -> pd.
         if v not in names:
             raise ValueError(f"compute_granger_table: {v} not in VAR names {names}")
 
-    rows = []
-    for caused in var_names:
-        for causing in var_names:
-            if caused == causing:
-                continue
-            try:
-                test = var_res.test_causality(caused=caused, causing=[causing], kind=kind)
-            except Exception:
-                # fallback if this statsmodels build doesn't like kind="f"
-                test = var_res.test_causality(caused=caused, causing=[causing], kind="wald")
-
-            rows.append(
-                {
-                    "caused": caused,
-                    "causing": causing,
-                    "kind": kind,
-                    "test_stat": float(getattr(test, "test_statistic", np.nan)),
-                    "p_value": float(getattr(test, "pvalue", np.nan)),
-                    "df_num": float(getattr(test, "df_num", np.nan)) if getattr(test, "df_num", None) is not None else np.nan,
-                    "df_denom": float(getattr(test, "df_denom", np.nan)) if getattr(test, "df_denom", None) is not None else np.nan,
-                }
-            )
-
-    return pd.DataFrame(rows)
+    tests = [([caused], [causing]) for caused in var_names for causing in var_names if causing != caused]
+    if block_exogeneity and len(var_names) > 2:
+        tests += [([caused], [v for v in var_names if v != caused]) for caused in var_names]
+    return var_granger_tests(var_res, tests, kind=kind)
@@ -2,38 +2,39 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional, Sequence
+from typing import List, Optional, Sequence
 import numpy as np
 import pandas as pd
 
+from python.workbook import WorkbookLike, open_workbook
+
 def ensure_parent_dir(path: str | Path) -> None:
     Path(path).parent.mkdir(parents=True, exist_ok=True)
 
 
 def _read_excel_one_sheet(
-    path: str,
+    path: WorkbookLike,
     sheet_name: Optional[str],
     preferred_names: Sequence[str],
+    cache_dir: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Always return ONE DataFrame (never a dict).
     If sheet_name is None, pick the first match in preferred_names,
     otherwise fallback to the first sheet in the workbook.
+    path may be an open WorkbookSession (the workbook is then opened/parsed only once).
+    With cache_dir, sheets are served from the columnar cache (see python/sheet_cache.py).
     """
-    xls = pd.ExcelFile(path)
-    if sheet_name is None:
-        for name in preferred_names:
-            if name in xls.sheet_names:
-                sheet_name = name
-                break
+    with open_workbook(path, cache_dir) as book:
         if sheet_name is None:
-            sheet_name = xls.sheet_names[0]
-
-    df = pd.read_excel(path, sheet_name=sheet_name)
+            for name in preferred_names:
+                if name in book.sheet_names:
+                    sheet_name = name
+                    break
+            if sheet_name is None:
+                sheet_name = book.sheet_names[0]
 
-    # Safety: if someone passes sheet_name=None to pandas directly, it can return dict.
-    if isinstance(df, dict):
-        df = list(df.values())[0]
+        df = book.sheet(sheet_name)
 
     if "date" in df.columns:
         df["date"] = pd.to_datetime(df["date"])
@@ -41,13 +42,13 @@ def _read_excel_one_sheet(
     return df
 
 
-def read_x_xlsx(path: str, sheet_name: Optional[str] = None) -> pd.DataFrame:
+def read_x_xlsx(path: WorkbookLike, sheet_name: Optional[str] = None, cache_dir: Optional[str] = None) -> pd.DataFrame:
     # Prefer HW2 convention
-    return _read_excel_one_sheet(path, sheet_name, preferred_names=("data_x", "x", "Sheet1"))
+    return _read_excel_one_sheet(path, sheet_name, preferred_names=("data_x", "x", "Sheet1"), cache_dir=cache_dir)
 
 
-def read_y_xlsx(path: str, sheet_name: Optional[str] = "data_y") -> pd.DataFrame:
-    return _read_excel_one_sheet(path, sheet_name, preferred_names=("data_y", "y", "Sheet1"))
+def read_y_xlsx(path: WorkbookLike, sheet_name: Optional[str] = "data_y", cache_dir: Optional[str] = None) -> pd.DataFrame:
+    return _read_excel_one_sheet(path, sheet_name, preferred_names=("data_y", "y", "Sheet1"), cache_dir=cache_dir)
 
 
 def read_top1_x_code_from_q1_csv(path: str) -> str:
@@ -59,6 +60,17 @@ def read_top1_x_code_from_q1_csv(path: str) -> str:
     return str(df["code"].iloc[0]).strip()
 
 
+def read_top_x_codes_from_q1_csv(path: str, n: Optional[int] = None) -> List[str]:
+    """All x codes of the Q1 ranking (or the first n), in rank order."""
+    df = pd.read_csv(path)
+    if "code" not in df.columns:
+        raise ValueError("Q1 csv must contain column 'code'.")
+    if len(df) == 0:
+        raise ValueError("Q1 csv is empty, cannot read x codes.")
+    codes = [str(c).strip() for c in df["code"]]
+    return codes if n is None else codes[:n]
+
+
 def write_csv(df: pd.DataFrame, out_path: str) -> None:
     ensure_parent_dir(out_path)
     df.to_csv(out_path, index=False)
@@ -102,21 +114,18 @@ def compute_orth_irf_table(
 def compute_granger_table(var_res, var_names: list[str]) -> pd.DataFrame:
     """
     Pure function: compute pairwise Granger causality (Wald) within a fitted VAR.
-    Returns a small table with p-values.
+    Returns a small table with p-values (all pairs in one batched call).
     """
-    rows: list[dict] = []
-    for caused in var_names:
-        for causing in var_names:
-            if caused == causing:
-                continue
-            test = var_res.test_causality(caused=caused, causing=[causing], kind="wald")
-            rows.append(
-                {
-                    "caused": caused,
-                    "causing": causing,
-                    "test_statistic": float(test.test_statistic),
-                    "df": int(test.df),
-                    "p_value": float(test.pvalue),
-                }
-            )
-    return pd.DataFrame(rows)
+    from python.var_ols import var_granger_tests
+
+    tests = [([caused], [causing]) for caused in var_names for causing in var_names if caused != causing]
+    out = var_granger_tests(var_res, tests, kind="wald")
+    return pd.DataFrame(
+        {
+            "caused": out["caused"],
+            "causing": out["causing"],
+            "test_statistic": out["test_stat"],
+            "df": out["df_num"].astype(int),
+            "p_value": out["p_value"],
+        }
+    )
@@ -0,0 +1,749 @@
+# python/var_ols.py
+# Lightweight NumPy VAR(p) kernels (no statsmodels import); same conventions as statsmodels VAR
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+_TREND_TERMS = {"n": 0, "c": 1, "ct": 2}
+
+
+def trend_order(trend: str) -> int:
+    if trend not in _TREND_TERMS:
+        raise ValueError(f"trend must be one of {sorted(_TREND_TERMS)}, got '{trend}'.")
+    return _TREND_TERMS[trend]
+
+
+def var_design(y: np.ndarray, max_lag: int, trend: str = "c") -> np.ndarray:
+    """
+    Lagged design for ALL rows t = 0..T-1, statsmodels column order:
+      [const, trend, y1_{t-1}, ..., yk_{t-1}, y1_{t-2}, ..., yk_{t-max_lag}]
+    The trend column is t + 1 (as statsmodels, whatever the lag order). Lags before the
+    sample start are 0; rows t < p must not be used for a VAR(p).
+    The first n_det + k*p columns are exactly the VAR(p) design, so all orders are nested.
+    """
+    y = np.asarray(y, dtype=float)
+    n_rows, k = y.shape
+    n_det = trend_order(trend)
+    z = np.zeros((n_rows, n_det + k * int(max_lag)))
+    if n_det >= 1:
+        z[:, 0] = 1.0
+    if n_det >= 2:
+        z[:, 1] = np.arange(1, n_rows + 1, dtype=float)
+    for lag in range(1, int(max_lag) + 1):
+        c0 = n_det + k * (lag - 1)
+        z[lag:, c0 : c0 + k] = y[:-lag]
+    return z
+
+
+def var_coef_matrices(params: np.ndarray, k: int, p: int, n_det: int) -> np.ndarray:
+    """(p, k, k) lag matrices A_l with A_l[i, j] = effect of variable j at lag l on equation i."""
+    return params[n_det : n_det + k * p].reshape(p, k, k).swapaxes(1, 2)
+
+
+def var_companion(coefs: np.ndarray) -> np.ndarray:
+    p, k, _ = coefs.shape
+    comp = np.zeros((k * p, k * p))
+    comp[:k, :] = np.concatenate(list(coefs), axis=1)
+    if p > 1:
+        comp[k:, :-k] = np.eye(k * (p - 1))
+    return comp
+
+
+def max_inverse_root_modulus(coefs: np.ndarray) -> float:
+    """max |root| of statsmodels VARResults.roots (roots are inverse companion eigenvalues)."""
+    eig = np.linalg.eigvals(var_companion(coefs))
+    with np.errstate(divide="ignore"):
+        return float(np.max(np.abs(1.0 / eig)))
+
+
+def portmanteau_pvalue(resid: np.ndarray, nlags: int, p: int) -> float:
+    """statsmodels VARResults.test_whiteness(nlags) p-value (non-adjusted); NaN if nlags <= p."""
+    from scipy import stats
+
+    if nlags - p <= 0:
+        return float("nan")
+    nobs, k = resid.shape
+    u = resid - resid.mean(axis=0)
+    c0_inv = np.linalg.inv(u.T @ u / nobs)
+    stat = 0.0
+    for h in range(1, nlags + 1):
+        ch = u[h:].T @ u[:-h] / nobs
+        stat += np.trace(ch.T @ c0_inv @ ch @ c0_inv)
+    stat *= nobs
+    return float(stats.chi2(k * k * (nlags - p)).sf(stat))
+
+
+def _chol_rank1_update(chol: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Lower Cholesky factor of L L' + x x' from L (O(m^2) Givens sweep)."""
+    chol = np.array(chol, dtype=float)
+    x = np.array(x, dtype=float)
+    for j in range(len(x)):
+        r = np.hypot(chol[j, j], x[j])
+        c, s = r / chol[j, j], x[j] / chol[j, j]
+        chol[j, j] = r
+        chol[j + 1 :, j] = (chol[j + 1 :, j] + s * x[j + 1 :]) / c
+        x[j + 1 :] = c * x[j + 1 :] - s * chol[j + 1 :, j]
+    return chol
+
+
+def var_lag_search(
+    y: np.ndarray,
+    max_lag: int = 8,
+    trend: str = "c",
+    whiteness_lags: int = 12,
+    alpha_sig: float = 0.05,
+    common_sample: bool = False,
+) -> pd.DataFrame:
+    """
+    VAR(1..max_lag) lag diagnostics from ONE lagged design and nested Cholesky factors.
+
+    The max-lag design is built once and only the largest Gram matrix is factorized. With
+    common_sample=True every order uses rows max_lag..T-1, so that factor contains all smaller
+    ones as leading blocks. With common_sample=False (default, as make_var_lag_diagnostics)
+    each order p uses its own effective sample (rows p..T-1, as VAR(df).fit(p) and the R
+    tables): going down from max_lag, order p's Gram matrix is the leading block of order
+    p+1's plus row p, so its factor is a rank-one update of the previous leading block.
+
+    Output: same columns as make_var_lag_diagnostics
+    (p, aic, hq, sc, fpe, serial_p_value, max_root_modulus, is_stable, n_significant_terms).
+    """
+    from scipy import special
+
+    y = np.asarray(y, dtype=float)
+    if y.ndim != 2 or not np.isfinite(y).all():
+        raise ValueError("var_lag_search: y must be a finite 2-D array.")
+    n_rows, k = y.shape
+    max_lag = int(max_lag)
+    n_det = trend_order(trend)
+    if max_lag < 1 or n_rows - max_lag <= n_det + k * max_lag:
+        raise ValueError("var_lag_search: not enough observations for max_lag.")
+
+    z = var_design(y, max_lag, trend)
+    zc = z[max_lag:]
+    gram = zc.T @ zc
+    chols = {max_lag: np.linalg.cholesky(gram)}
+    for p in range(max_lag - 1, 0, -1):
+        m = n_det + k * p
+        chols[p] = chols[p + 1][:m, :m] if common_sample else _chol_rank1_update(chols[p + 1][:m, :m], z[p, :m])
+
+    rows: List[Dict[str, object]] = []
+    for p in range(1, max_lag + 1):
+        m = n_det + k * p
+        start = max_lag if common_sample else p
+        zp, yp = z[start:, :m], y[start:]
+        chol = chols[p]
+
+        rhs = zp.T @ yp
+        w = np.linalg.solve(chol, rhs)
+        params = np.linalg.solve(chol.T, w)
+        resid = yp - zp @ params
+
+        nobs = len(yp)
+        df_resid = nobs - m
+        sse = resid.T @ resid
+        sigma_u = sse / df_resid
+        ld = 2.0 * np.sum(np.log(np.diag(np.linalg.cholesky(sse / nobs))))
+        free_params = p * k * k + k * n_det
+        aic = ld + (2.0 / nobs) * free_params
+        bic = ld + (np.log(nobs) / nobs) * free_params
+        hqic = ld + (2.0 * np.log(np.log(nobs)) / nobs) * free_params
+        fpe = ((nobs + m) / df_resid) ** k * np.exp(ld)
+
+        chol_inv = np.linalg.solve(chol, np.eye(m))
+        xtx_inv_diag = np.sum(chol_inv * chol_inv, axis=0)
+        stderr = np.sqrt(np.outer(xtx_inv_diag, np.diag(sigma_u)))
+        pvals = special.erfc(np.abs(params / stderr) / np.sqrt(2.0))  # 2 * norm.sf(|t|), as statsmodels
+
+        max_root = max_inverse_root_modulus(var_coef_matrices(params, k, p, n_det))
+        rows.append(
+            dict(
+                p=p,
+                aic=float(aic),
+                hq=float(hqic),
+                sc=float(bic),
+                fpe=float(fpe),
+                serial_p_value=portmanteau_pvalue(resid, whiteness_lags, p),
+                max_root_modulus=max_root,
+                is_stable=bool(max_root < 1.0),
+                n_significant_terms=int((pvals[n_det:] < alpha_sig).sum()),
+            )
+        )
+
+    return pd.DataFrame(rows)
+
+
+def var_param_names(names: Sequence[str], p: int, trend: str) -> List[str]:
+    """Row labels of the params matrix, as statsmodels (const, trend, L1.y1, ...)."""
+    det = ["const", "trend"][: trend_order(trend)]
+    return det + [f"L{lag}.{v}" for lag in range(1, p + 1) for v in names]
+
+
+@dataclass(frozen=True)
+class VarTestResult:
+    """Subset of the statsmodels test result attributes used by this repo."""
+    test_statistic: float
+    pvalue: float
+    df: object
+
+
+@dataclass(frozen=True)
+class VarIrf:
+    irfs: np.ndarray       # (periods+1, k, k) MA coefficient matrices
+    orth_irfs: np.ndarray  # (periods+1, k, k) Cholesky-orthogonalized
+
+
+@dataclass(frozen=True, eq=False)
+class VarFit:
+    """
+    Compact fitted VAR(p) state; everything else is derived from it without statsmodels.
+
+    Attribute and method names follow statsmodels VARResults (params, stderr, pvalues, roots,
+    irf, test_causality, test_whiteness, forecast, ...), so extract_var_coef_table,
+    compute_orth_irf_table and compute_granger_table accept either object.
+    coef: (n_det + k*p, k) in statsmodels params layout; sigma_u: df-adjusted residual
+    covariance; xtx_inv: (Z'Z)^-1 of the lagged design; resid: (nobs, k).
+    """
+    names: Tuple[str, ...]
+    trend: str
+    k_ar: int
+    nobs: int
+    coef: np.ndarray
+    sigma_u: np.ndarray
+    xtx_inv: np.ndarray
+    resid: np.ndarray
+
+    @property
+    def neqs(self) -> int:
+        return len(self.names)
+
+    @property
+    def n_det(self) -> int:
+        return trend_order(self.trend)
+
+    @property
+    def df_model(self) -> int:
+        return self.n_det + self.neqs * self.k_ar
+
+    @property
+    def df_resid(self) -> int:
+        return self.nobs - self.df_model
+
+    @property
+    def n_totobs(self) -> int:
+        return self.nobs + self.k_ar
+
+    @property
+    def param_names(self) -> List[str]:
+        return var_param_names(self.names, self.k_ar, self.trend)
+
+    @property
+    def coefs(self) -> np.ndarray:
+        return var_coef_matrices(self.coef, self.neqs, self.k_ar, self.n_det)
+
+    def _frame(self, values: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(values, index=self.param_names, columns=list(self.names))
+
+    @property
+    def params(self) -> pd.DataFrame:
+        return self._frame(self.coef)
+
+    def cov_params(self) -> np.ndarray:
+        """Covariance of vec(params.T): kron((Z'Z)^-1, sigma_u), as statsmodels."""
+        return np.kron(self.xtx_inv, self.sigma_u)
+
+    @property
+    def stderr(self) -> pd.DataFrame:
+        se = np.sqrt(np.diag(self.cov_params())).reshape((self.df_model, self.neqs), order="C")
+        return self._frame(se)
+
+    @property
+    def tvalues(self) -> pd.DataFrame:
+        return self.params / self.stderr
+
+    @property
+    def pvalues(self) -> pd.DataFrame:
+        from scipy import stats
+
+        return self._frame(2 * stats.norm.sf(np.abs(self.tvalues.to_numpy())))
+
+    @property
+    def roots(self) -> np.ndarray:
+        """Inverse companion eigenvalues, largest modulus first (statsmodels VARResults.roots)."""
+        roots = np.linalg.eig(var_companion(self.coefs))[0] ** -1
+        return roots[np.argsort(np.abs(roots))[::-1]]
+
+    @property
+    def info_criteria(self) -> Dict[str, float]:
+        from scipy import linalg
+
+        k, nobs = self.neqs, self.nobs
+        free_params = self.k_ar * k * k + k * self.n_det
+        c, _ = linalg.cho_factor(self.sigma_u * self.df_resid / nobs, lower=True)
+        ld = 2 * np.sum(np.log(c.diagonal()))
+        return {
+            "aic": ld + (2.0 / nobs) * free_params,
+            "bic": ld + (np.log(nobs) / nobs) * free_params,
+            "hqic": ld + (2.0 * np.log(np.log(nobs)) / nobs) * free_params,
+            "fpe": ((nobs + self.df_model) / self.df_resid) ** k * np.exp(ld),
+        }
+
+    @property
+    def aic(self) -> float:
+        return self.info_criteria["aic"]
+
+    @property
+    def bic(self) -> float:
+        return self.info_criteria["bic"]
+
+    @property
+    def hqic(self) -> float:
+        return self.info_criteria["hqic"]
+
+    @property
+    def fpe(self) -> float:
+        return self.info_criteria["fpe"]
+
+    def ma_rep(self, maxn: int = 10) -> np.ndarray:
+        coefs = self.coefs
+        p, k = self.k_ar, self.neqs
+        phis = np.zeros((maxn + 1, k, k))
+        phis[0] = np.eye(k)
+        for i in range(1, maxn + 1):
+            for j in range(1, min(i, p) + 1):
+                phis[i] += np.dot(phis[i - j], coefs[j - 1])
+        return phis
+
+    def irf(self, periods: int = 10) -> VarIrf:
+        phis = self.ma_rep(periods)
+        chol = np.linalg.cholesky(self.sigma_u)
+        return VarIrf(irfs=phis, orth_irfs=np.array([np.dot(m, chol) for m in phis]))
+
+    def test_whiteness(self, nlags: int = 10) -> VarTestResult:
+        """Portmanteau test (non-adjusted); ValueError if nlags <= k_ar, as statsmodels."""
+        from scipy import stats
+
+        if nlags - self.k_ar <= 0:
+            raise ValueError(f"test_whiteness: nlags must be larger than k_ar ({self.k_ar}).")
+        u = self.resid - self.resid.mean(0)
+        acov = [u.T @ u if h == 0 else np.dot(u[h:].T, u[:-h]) for h in range(nlags + 1)]
+        acov = np.array(acov) / len(u)
+        cov0_inv = np.linalg.inv(acov[0])
+        statistic = 0
+        for h in range(1, nlags + 1):
+            statistic += np.trace(acov[h].T @ cov0_inv @ acov[h] @ cov0_inv)
+        statistic *= self.nobs
+        df = self.neqs**2 * (nlags - self.k_ar)
+        return VarTestResult(test_statistic=statistic, pvalue=stats.chi2(df).sf(statistic), df=df)
+
+    def test_causality(self, caused, causing, kind: str = "f") -> VarTestResult:
+        """Granger causality Wald / F test of causing -> caused (statsmodels VARResults.test_causality)."""
+        from scipy import stats
+
+        caused = [caused] if isinstance(caused, str) else list(caused)
+        causing = [causing] if isinstance(causing, str) else list(causing)
+        names = list(self.names)
+        caused_ind = [names.index(c) for c in caused]
+        causing_ind = [names.index(c) for c in causing]
+
+        k, p = self.neqs, self.k_ar
+        num_restr = len(causing) * len(caused) * p
+        restr = np.zeros((num_restr, k * self.n_det + k**2 * p))
+        row = 0
+        for j in range(p):
+            for ing in causing_ind:
+                for ed in caused_ind:
+                    restr[row, k * self.n_det + ed + k * ing + k**2 * j] = 1
+                    row += 1
+
+        cb = np.dot(restr, self.coef.ravel())  # vec(params.T)
+        middle = np.linalg.inv(restr @ self.cov_params() @ restr.T)
+        statistic = cb @ middle @ cb
+        if kind.lower() == "wald":
+            df = num_restr
+            dist = stats.chi2(df)
+        elif kind.lower() == "f":
+            statistic = statistic / num_restr
+            df = (num_restr, k * self.df_resid)
+            dist = stats.f(*df)
+        else:
+            raise ValueError(f"test_causality: kind {kind} not recognized")
+        return VarTestResult(test_statistic=statistic, pvalue=dist.sf(statistic), df=df)
+
+    def forecast(self, y: np.ndarray, steps: int) -> np.ndarray:
+        """steps-ahead forecasts from the last k_ar rows of y (statsmodels VARResults.forecast)."""
+        y = np.asarray(y, dtype=float)
+        p = self.k_ar
+        if y.shape[0] < p:
+            raise ValueError(f"forecast: y must have at least {p} rows.")
+        det = np.zeros((steps, self.n_det))
+        if self.n_det >= 1:
+            det[:, 0] = 1.0
+        if self.n_det >= 2:
+            det[:, 1] = np.arange(self.n_totobs + 1, self.n_totobs + 1 + steps)
+        forcs = det @ self.coef[: self.n_det] if self.n_det else np.zeros((steps, self.neqs))
+        coefs = self.coefs
+        for h in range(1, steps + 1):
+            f = forcs[h - 1]
+            for i in range(1, p + 1):
+                prior_y = y[h - i - 1] if h - i <= 0 else forcs[h - i - 1]
+                f = f + np.dot(coefs[i - 1], prior_y)
+            forcs[h - 1] = f
+        return forcs
+
+
+def fit_var_ols(
+    y: np.ndarray | pd.DataFrame,
+    p: int,
+    trend: str = "c",
+    names: Optional[Sequence[str]] = None,
+) -> VarFit:
+    """
+    OLS VAR(p) with the same design, lstsq call and df correction as statsmodels VAR(y).fit(p),
+    so the estimates agree with statsmodels to the last bits.
+    """
+    if isinstance(y, pd.DataFrame):
+        names = [str(c) for c in y.columns] if names is None else names
+        y = y.to_numpy(dtype=float)
+    y = np.asarray(y, dtype=float)
+    if y.ndim != 2:
+        raise ValueError("fit_var_ols: y must be 2-D.")
+    n_rows, k = y.shape
+    names = [f"y{i + 1}" for i in range(k)] if names is None else [str(v) for v in names]
+    if len(names) != k:
+        raise ValueError("fit_var_ols: names length must match the number of columns.")
+    p = int(p)
+    if p < 1 or n_rows - p <= trend_order(trend) + k * p:
+        raise ValueError("fit_var_ols: not enough observations for this lag order.")
+
+    z = var_design(y, p, trend)[p:]
+    y_sample = y[p:]
+    params = np.linalg.lstsq(z, y_sample, rcond=1e-15)[0]
+    resid = y_sample - np.dot(z, params)
+    df_resid = len(y_sample) - (k * p + trend_order(trend))
+    sigma_u = np.dot(resid.T, resid) / df_resid
+    return VarFit(
+        names=tuple(names),
+        trend=trend,
+        k_ar=p,
+        nobs=len(y_sample),
+        coef=params,
+        sigma_u=sigma_u,
+        xtx_inv=np.linalg.inv(z.T @ z),
+        resid=resid,
+    )
+
+
+class RecursiveVarOLS:
+    """
+    Online multivariate OLS (all VAR equations share the design row z).
+
+    Keeps P = (Z'Z)^-1 and the coefficients B, updated with Sherman-Morrison rank-one steps:
+    add() for a new observation, remove() for dropping an old one (rolling windows), each
+    O(m^2 * k) with m = len(z). The exact sums Z'Z and Z'Y are carried alongside, and every
+    refresh_every updates P and B are recomputed from them, so rounding drift stays bounded.
+    """
+
+    def __init__(self, z0: np.ndarray, y0: np.ndarray, refresh_every: int = 64) -> None:
+        z0 = np.asarray(z0, dtype=float)
+        y0 = np.asarray(y0, dtype=float)
+        if z0.ndim != 2 or y0.ndim != 2 or len(z0) != len(y0):
+            raise ValueError("RecursiveVarOLS: z0 and y0 must be 2-D with the same number of rows.")
+        if len(z0) < z0.shape[1]:
+            raise ValueError("RecursiveVarOLS: need at least as many rows as regressors.")
+        self.refresh_every = int(refresh_every)
+        self.nobs = len(z0)
+        self.gram = z0.T @ z0
+        self.zy = z0.T @ y0
+        self._refresh()
+
+    def _refresh(self) -> None:
+        self.p_inv = np.linalg.inv(self.gram)
+        self.coef = self.p_inv @ self.zy
+        self._since_refresh = 0
+
+    def _step(self, z: np.ndarray, y: np.ndarray, sign: float) -> None:
+        z = np.asarray(z, dtype=float)
+        y = np.asarray(y, dtype=float)
+        self.gram += sign * np.outer(z, z)
+        self.zy += sign * np.outer(z, y)
+        self.nobs += int(sign)
+
+        pz = self.p_inv @ z
+        denom = 1.0 + sign * (z @ pz)
+        if denom <= 1e-12:  # (near-)singular downdate: fall back to an exact solve
+            self._refresh()
+            return
+        gain = sign * pz / denom
+        self.coef += np.outer(gain, y - z @ self.coef)
+        self.p_inv -= np.outer(gain, pz)
+
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh_every:
+            self._refresh()
+
+    def add(self, z: np.ndarray, y: np.ndarray) -> None:
+        self._step(z, y, 1.0)
+
+    def remove(self, z: np.ndarray, y: np.ndarray) -> None:
+        self._step(z, y, -1.0)
+
+
+def var_forecast_path(
+    coef: np.ndarray,
+    y_last: np.ndarray,
+    trend: str,
+    steps: int,
+    trend_start: int = 1,
+) -> np.ndarray:
+    """
+    (steps, k) forecasts h = 1..steps from companion-matrix powers, computed once:
+      y(h) = [A^h s]_k + sum_{i=1..h} [A^(h-i)]_kk d_i
+    s stacks the last p observations (y_last, oldest first), d_i the deterministic part at step i.
+    trend_start is the trend value of the first forecast row (statsmodels: n_totobs + 1).
+    """
+    y_last = np.asarray(y_last, dtype=float)
+    k = coef.shape[1]
+    n_det = trend_order(trend)
+    p = (coef.shape[0] - n_det) // k
+    if y_last.shape[0] < p:
+        raise ValueError(f"var_forecast_path: y_last must have at least {p} rows.")
+    steps = int(steps)
+    if steps < 1:
+        raise ValueError("var_forecast_path: steps must be >= 1.")
+
+    comp = var_companion(var_coef_matrices(coef, k, p, n_det))
+    powers = np.empty((steps + 1, k * p, k * p))
+    powers[0] = np.eye(k * p)
+    for h in range(1, steps + 1):
+        powers[h] = comp @ powers[h - 1]
+
+    state = y_last[::-1][:p].reshape(-1)  # [y_T, y_{T-1}, ..., y_{T-p+1}]
+    out = (powers[1:, :k, :] @ state).reshape(steps, k)
+    if n_det:
+        det = np.zeros((steps, n_det))
+        det[:, 0] = 1.0
+        if n_det >= 2:
+            det[:, 1] = np.arange(trend_start, trend_start + steps)
+        d = det @ coef[:n_det]  # (steps, k)
+        top = powers[:, :k, :k]
+        for h in range(1, steps + 1):
+            out[h - 1] += np.einsum("ijk,ik->j", top[h - 1 :: -1][:h], d[:h])
+    return out
+
+
+def var_ma_matrices(coefs: np.ndarray, steps: int) -> np.ndarray:
+    """(steps+1, k, k) MA(inf) matrices Phi_h = J A^h J' from powers of the companion matrix A."""
+    p, k, _ = coefs.shape
+    comp = var_companion(coefs)
+    out = np.empty((int(steps) + 1, k, k))
+    power = np.eye(k * p)
+    for h in range(int(steps) + 1):
+        out[h] = power[:k, :k]
+        power = comp @ power
+    return out
+
+
+def orth_irf_by_ordering(ma: np.ndarray, sigma_u: np.ndarray, order: Sequence[int]) -> np.ndarray:
+    """
+    Orthogonalized IRFs for one Cholesky ordering, in ORIGINAL variable indexing:
+    out[h, i, j] = response of variable i to a one-s.d. orthogonal shock in variable j.
+    Equivalent to refitting on reordered columns: Sigma_u is permuted and re-factored, no refit.
+    """
+    order = np.asarray(order, dtype=int)
+    chol = np.linalg.cholesky(sigma_u[np.ix_(order, order)])
+    out = np.empty_like(ma)
+    out[:, :, order] = ma[:, :, order] @ chol
+    return out
+
+
+def generalized_irf(ma: np.ndarray, sigma_u: np.ndarray) -> np.ndarray:
+    """
+    Generalized (Pesaran-Shin) IRFs, ordering-invariant: out[h, i, j] = (Phi_h Sigma_u e_j)_i / sqrt(sigma_jj),
+    the response of variable i to a one-s.d. shock in variable j with the other shocks integrated out.
+    """
+    return ma @ sigma_u / np.sqrt(np.diag(sigma_u))
+
+
+def var_fevd(ma: np.ndarray, sigma_u: np.ndarray, kind: str = "generalized") -> np.ndarray:
+    """
+    Forecast-error variance decomposition for all horizons at once: out[h, i, j] = share of the
+    (h+1)-step forecast-error variance of variable i due to shock j (rows sum to 1).
+    kind "orth": Cholesky shocks in column order (statsmodels fevd); "generalized": Pesaran-Shin
+    shares, row-normalized (the raw shares do not sum to 1 when Sigma_u is not diagonal).
+    """
+    if kind == "orth":
+        contrib = np.cumsum((ma @ np.linalg.cholesky(sigma_u)) ** 2, axis=0)
+    elif kind == "generalized":
+        contrib = np.cumsum(generalized_irf(ma, sigma_u) ** 2, axis=0)
+    else:
+        raise ValueError(f"var_fevd: kind must be 'orth' or 'generalized', got '{kind}'.")
+    return contrib / contrib.sum(axis=2, keepdims=True)
+
+
+def simulate_var_bootstrap(
+    coef: np.ndarray,
+    y_init: np.ndarray,
+    resid: np.ndarray,
+    trend: str,
+    n_rows: int,
+    n_rep: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    (n_rep, n_rows, k) residual-bootstrap series: the first p rows are y_init, then
+    y*_t = d_t B_det + sum_l A_l y*_{t-l} + u*_t with u*_t drawn (with replacement) from the
+    centered residuals; all replicates advance together, one batched product per time step.
+    """
+    k = coef.shape[1]
+    n_det = trend_order(trend)
+    p = (coef.shape[0] - n_det) // k
+    u = resid - resid.mean(axis=0)
+    shocks = u[rng.integers(0, len(u), size=(n_rep, n_rows - p))]
+
+    det = np.zeros((n_rows, n_det))
+    if n_det >= 1:
+        det[:, 0] = 1.0
+    if n_det >= 2:
+        det[:, 1] = np.arange(1, n_rows + 1)
+    det_part = det @ coef[:n_det] if n_det else np.zeros((n_rows, k))
+    lag_coef = coef[n_det:]
+
+    y = np.empty((n_rep, n_rows, k))
+    y[:, :p] = y_init[-p:]
+    for t in range(p, n_rows):
+        lagged = y[:, t - p : t][:, ::-1].reshape(n_rep, k * p)  # [y_{t-1}, ..., y_{t-p}]
+        y[:, t] = lagged @ lag_coef + det_part[t] + shocks[:, t - p]
+    return y
+
+
+def fit_var_ols_batch(y: np.ndarray, p: int, trend: str = "c") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    OLS VAR(p) for a stack of series y (n_rep, n_rows, k) in one batched solve.
+    Returns coef (n_rep, n_det + k*p, k) in statsmodels layout and df-adjusted sigma_u (n_rep, k, k).
+    """
+    n_rep, n_rows, k = y.shape
+    n_det = trend_order(trend)
+    m = n_det + k * p
+    z = np.empty((n_rep, n_rows - p, m))
+    if n_det >= 1:
+        z[:, :, 0] = 1.0
+    if n_det >= 2:
+        z[:, :, 1] = np.arange(p + 1, n_rows + 1)
+    for lag in range(1, p + 1):
+        c0 = n_det + k * (lag - 1)
+        z[:, :, c0 : c0 + k] = y[:, p - lag : n_rows - lag]
+    y_sample = y[:, p:]
+    zt = z.transpose(0, 2, 1)
+    coef = np.linalg.solve(zt @ z, zt @ y_sample)
+    resid = y_sample - z @ coef
+    sigma_u = resid.transpose(0, 2, 1) @ resid / (n_rows - p - m)
+    return coef, sigma_u
+
+
+def orth_irf_batch(
+    coef: np.ndarray,
+    sigma_u: np.ndarray,
+    trend: str,
+    steps: int,
+    order: Sequence[int],
+) -> np.ndarray:
+    """Batched orth_irf_by_ordering for stacked fits: (n_rep, steps+1, k, k), original indexing."""
+    n_rep, _, k = coef.shape
+    n_det = trend_order(trend)
+    p = (coef.shape[1] - n_det) // k
+    comp = np.zeros((n_rep, k * p, k * p))
+    comp[:, :k, :] = coef[:, n_det:].transpose(0, 2, 1)  # [A_1 ... A_p]
+    if p > 1:
+        comp[:, k:, :-k] = np.eye(k * (p - 1))
+
+    ma = np.empty((n_rep, steps + 1, k, k))
+    power = np.broadcast_to(np.eye(k * p), comp.shape)
+    for h in range(steps + 1):
+        ma[:, h] = power[:, :k, :k]
+        power = comp @ power
+
+    order = np.asarray(order, dtype=int)
+    chol = np.linalg.cholesky(sigma_u[:, order][:, :, order])
+    out = np.empty_like(ma)
+    out[..., order] = ma[..., order] @ chol[:, None]
+    return out
+
+
+def _granger_arrays(var_res) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray, int, float]:
+    """(names, coef, (Z'Z)^-1, sigma_u, k_ar, df_resid) of a VarFit or statsmodels VARResults."""
+    if isinstance(var_res, VarFit):
+        return list(var_res.names), var_res.coef, var_res.xtx_inv, var_res.sigma_u, var_res.k_ar, float(var_res.df_resid)
+    z = np.asarray(var_res.endog_lagged, dtype=float)
+    return (
+        list(var_res.names),
+        np.asarray(var_res.params, dtype=float),
+        np.linalg.inv(z.T @ z),
+        np.asarray(var_res.sigma_u, dtype=float),
+        int(var_res.k_ar),
+        float(var_res.df_resid),
+    )
+
+
+def var_granger_tests(var_res, tests: Sequence[Tuple[Sequence[str], Sequence[str]]], kind: str = "f") -> pd.DataFrame:
+    """
+    Granger causality tests (causing -> caused) for many restrictions at once, as test_causality.
+
+    Every restriction is a selection of coefficient indices (row of params, equation); its block of
+    cov_params = kron((Z'Z)^-1, Sigma_u) is gathered elementwise from the two factors, so the full
+    covariance is never formed and tests with the same number of restrictions share one batched solve.
+    tests: (caused names, causing names) pairs, e.g. (["dy"], ["dx"]) or block exogeneity
+    (["dy"], ["dx", "z"]). Returns columns: caused, causing (comma-joined), kind, test_stat,
+    p_value, df_num, df_denom (NaN for kind "wald").
+    """
+    from scipy import stats
+
+    kind = kind.lower()
+    if kind not in ("f", "wald"):
+        raise ValueError(f"var_granger_tests: kind {kind} not recognized")
+    names, coef, xtx_inv, sigma_u, p, df_resid = _granger_arrays(var_res)
+    k = len(names)
+    n_det = coef.shape[0] - k * p
+
+    rows_idx, eqs_idx = [], []
+    for caused, causing in tests:
+        for v in list(caused) + list(causing):
+            if v not in names:
+                raise ValueError(f"var_granger_tests: {v} not in VAR names {names}")
+        # restriction order as test_causality: lag, then causing, then caused
+        r = [n_det + j * k + names.index(ing) for j in range(p) for ing in causing for _ in caused]
+        e = [names.index(ed) for _ in range(p) for _ in causing for ed in caused]
+        rows_idx.append(np.asarray(r, dtype=int))
+        eqs_idx.append(np.asarray(e, dtype=int))
+
+    stat = np.empty(len(tests))
+    q_all = np.array([len(r) for r in rows_idx])
+    for q in np.unique(q_all):
+        sel = np.flatnonzero(q_all == q)
+        r = np.stack([rows_idx[i] for i in sel])
+        e = np.stack([eqs_idx[i] for i in sel])
+        cb = coef[r, e]
+        cov = xtx_inv[r[:, :, None], r[:, None, :]] * sigma_u[e[:, :, None], e[:, None, :]]
+        stat[sel] = np.einsum("ti,ti->t", cb, np.linalg.solve(cov, cb[:, :, None])[:, :, 0])
+
+    if kind == "wald":
+        pvalue = stats.chi2.sf(stat, q_all)
+        df_denom = np.full(len(tests), np.nan)
+    else:
+        stat = stat / q_all
+        df_denom = np.full(len(tests), k * df_resid)
+        pvalue = stats.f.sf(stat, q_all, df_denom)
+    return pd.DataFrame(
+        {
+            "caused": [",".join(c) for c, _ in tests],
+            "causing": [",".join(c) for _, c in tests],
+            "kind": kind,
+            "test_stat": stat,
+            "p_value": pvalue,
+            "df_num": q_all.astype(float),
+            "df_denom": df_denom,
+        }
+    )
@@ -6,12 +6,6 @@ from typing import Iterable
 
 import numpy as np
 
-import matplotlib
-matplotlib.use("Agg")  # important for headless/CI
-import matplotlib.pyplot as plt
-
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-
 
 def _to_finite_1d(x: Iterable[float]) -> np.ndarray:
     """Convert input to 1D float array and drop non-finite values."""
@@ -38,6 +32,12 @@ def save_acf_pacf_pair(
     if x.size < 3:
         raise ValueError("Series too short after removing missing values.")
 
+    # heavy imports only when a figure is actually drawn (keeps script start-up fast)
+    import matplotlib
+    matplotlib.use("Agg")  # important for headless/CI
+    import matplotlib.pyplot as plt
+    from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
+
     # Make sure nlags is feasible
     max_lags = max(1, x.size - 1)
     nlags = int(min(nlags, max_lags))
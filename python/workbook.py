@@ -0,0 +1,111 @@
+# python/workbook.py
+# One open handle per workbook; each sheet parsed at most once (optionally via the columnar cache)
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import pandas as pd
+
+from python.sheet_cache import file_sha256, read_sheet_cached, sheet_names_cached
+
+
+class WorkbookSession:
+    """
+    Lazy workbook handle.
+
+    - The workbook is opened on first need (never, if everything is served from cache_dir).
+    - sheet(name) parses a sheet once and memoizes the DataFrame; other sheets stay unparsed.
+    - iter_sheet_chunks(name) streams a large sheet row block by row block (read-only mode),
+      without materializing the whole sheet.
+    Callers get copies from sheet(), so the memoized frames cannot be mutated from outside.
+    """
+
+    def __init__(self, path: str | Path, cache_dir: Optional[str | Path] = None) -> None:
+        self.path = Path(path)
+        self.cache_dir = cache_dir
+        self._xls: Optional[pd.ExcelFile] = None
+        self._digest: Optional[str] = None
+        self._sheet_names: Optional[list[str]] = None
+        self._frames: dict[str, pd.DataFrame] = {}
+
+    def __enter__(self) -> "WorkbookSession":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._xls is not None:
+            self._xls.close()
+            self._xls = None
+
+    def _handle(self) -> pd.ExcelFile:
+        if self._xls is None:
+            self._xls = pd.ExcelFile(self.path)
+        return self._xls
+
+    def _content_digest(self) -> Optional[str]:
+        if self.cache_dir is not None and self._digest is None:
+            self._digest = file_sha256(self.path)
+        return self._digest
+
+    @property
+    def sheet_names(self) -> list[str]:
+        if self._sheet_names is None:
+            self._sheet_names = sheet_names_cached(
+                self.path, lambda: self._handle().sheet_names, self.cache_dir, self._content_digest()
+            )
+        return list(self._sheet_names)
+
+    def sheet(self, name: str) -> pd.DataFrame:
+        if name not in self.sheet_names:
+            raise ValueError(f"{self.path.name} has no sheet '{name}'. Available: {self.sheet_names}")
+        if name not in self._frames:
+            self._frames[name] = read_sheet_cached(
+                self.path, name, lambda: self._handle().parse(name), self.cache_dir, self._content_digest()
+            )
+        return self._frames[name].copy()
+
+    def iter_sheet_chunks(self, name: str, chunk_rows: int = 10_000) -> Iterator[pd.DataFrame]:
+        """
+        Read-only streaming: yield consecutive row blocks of a sheet (first row = header).
+        Needs an openpyxl-backed workbook (.xlsx); memory is bounded by chunk_rows.
+        """
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be >= 1.")
+        if name not in self.sheet_names:
+            raise ValueError(f"{self.path.name} has no sheet '{name}'. Available: {self.sheet_names}")
+
+        book = self._handle().book
+        if not hasattr(book, "worksheets"):
+            raise ValueError(f"Streaming needs an .xlsx workbook, got: {self.path.name}")
+
+        rows = book[name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = [f"Unnamed: {i}" if h is None else str(h) for i, h in enumerate(header)]
+
+        block: list[tuple] = []
+        for row in rows:
+            block.append(row)
+            if len(block) == chunk_rows:
+                yield pd.DataFrame(block, columns=header)
+                block = []
+        if block:
+            yield pd.DataFrame(block, columns=header)
+
+
+WorkbookLike = Union[str, Path, WorkbookSession]
+
+
+@contextmanager
+def open_workbook(source: WorkbookLike, cache_dir: Optional[str | Path] = None) -> Iterator[WorkbookSession]:
+    """Use an existing session as-is, or open (and afterwards close) a new one for a path."""
+    if isinstance(source, WorkbookSession):
+        yield source
+        return
+    with WorkbookSession(source, cache_dir=cache_dir) as book:
+        yield book
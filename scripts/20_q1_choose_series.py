@@ -16,17 +16,20 @@ from python.q1_io import (
 )
 from python.q1_core import Q1Config, q1_select_top5
 from python.q1_plot import save_top5_barh
+from python.workbook import WorkbookSession
 
 
 def main() -> None:
     x_path = ROOT / "data" / "raw" / "x.xlsx"
     y_path = ROOT / "data" / "raw" / "y.xlsx"
+    cache_dir = ROOT / "output" / "cache"  # columnar copies of the sheets, keyed by workbook hash
 
     cfg = Q1Config(date_col="date", y_col="import_clv_qna_sa", top_n=5, min_obs=30, train_ratio=0.8, diff_lag=1)
 
-    x = read_x_strict_one_sheet(x_path)
-    y = read_y_sheet_strict(y_path, sheet_name="data_y")
-    desc = read_desc_sheet_strict(y_path, sheet_name="descriptions")
+    x = read_x_strict_one_sheet(x_path, cache_dir=cache_dir)
+    with WorkbookSession(y_path, cache_dir=cache_dir) as y_book:  # y.xlsx opened once for both sheets
+        y = read_y_sheet_strict(y_book, sheet_name="data_y")
+        desc = read_desc_sheet_strict(y_book, sheet_name="descriptions")
 
     require_columns(x, [cfg.date_col], context=f"{x_path.name} (only sheet)")
     require_columns(y, [cfg.date_col, cfg.y_col], context=f"{y_path.name} (sheet=data_y)")
@@ -13,12 +13,17 @@ import pandas as pd
 from python.var_core import (
     prepare_var_level_data,
     recursive_var_one_step_forecast_level,
+    recursive_var_multi_horizon_forecast_level,
+    var_grid_backtest,
+    forecast_interval_coverage,
     compute_rmse,
 )
+from python.var_cache import FoldCheckpointStore
 from python.var_io import (
     read_x_xlsx,
     read_y_xlsx,
     read_top1_x_code_from_q1_csv,
+    read_top_x_codes_from_q1_csv,
     read_txt_int,
     write_csv,
     write_txt,
@@ -31,12 +36,13 @@ def main() -> None:
 
     x_path = "data/raw/x.xlsx"
     y_path = "data/raw/y.xlsx"
+    cache_dir = "output/cache"
 
     q1_csv = "output/tables/q1_top5_abs_corr_R.csv"
     x_code = read_top1_x_code_from_q1_csv(q1_csv)
 
-    x_df = read_x_xlsx(x_path, sheet_name="data_x")
-    y_df = read_y_xlsx(y_path, sheet_name="data_y")
+    x_df = read_x_xlsx(x_path, sheet_name="data_x", cache_dir=cache_dir)
+    y_df = read_y_xlsx(y_path, sheet_name="data_y", cache_dir=cache_dir)
 
     if x_code not in x_df.columns:
         raise ValueError(f"Selected x_code '{x_code}' not found in x.xlsx (data_x).")
@@ -57,6 +63,7 @@ def main() -> None:
     else:
         p_star = read_txt_int("output/tables/q2_var_selected_lag.txt")
 
+    # Folds whose data prefix is unchanged since the last run are read back from the checkpoint
     pred = recursive_var_one_step_forecast_level(
         level_df=panel,
         date_col=date_col,
@@ -66,12 +73,61 @@ def main() -> None:
         train_ratio=0.8,
         diff_lag=1,
         trend="c",
+        checkpoint=FoldCheckpointStore("output/cache/backtest/q3_folds.jsonl"),
     )
 
     rmse_val = compute_rmse(pred["y_true"].to_numpy(), pred["y_pred"].to_numpy())
     write_csv(pred, "output/tables_py/q3_var_recursive_forecasts_py.csv")
     write_txt(f"{rmse_val:.6f}", "output/tables_py/q3_var_rmse_py.txt")
 
+    # 80% / 95% residual-bootstrap intervals for the same folds (seeded, RLS engine)
+    pred_int = recursive_var_one_step_forecast_level(
+        level_df=panel,
+        date_col=date_col,
+        y_col=y_col,
+        x_col=x_code,
+        p=p_star,
+        train_ratio=0.8,
+        diff_lag=1,
+        trend="c",
+        engine="rls",
+        n_boot=2000,
+        interval_levels=(0.8, 0.95),
+        seed=0,
+    )
+    write_csv(pred_int, "output/tables_py/q3_var_recursive_intervals_py.csv")
+    write_csv(forecast_interval_coverage(pred_int), "output/tables_py/q3_var_interval_coverage_py.csv")
+
+    # 1..8-quarter-ahead accuracy from the same folds (companion powers, one estimate per fold)
+    multi, rmse_h = recursive_var_multi_horizon_forecast_level(
+        level_df=panel,
+        date_col=date_col,
+        y_col=y_col,
+        x_col=x_code,
+        p=p_star,
+        horizon=8,
+        train_ratio=0.8,
+        diff_lag=1,
+        trend="c",
+    )
+    write_csv(multi, "output/tables_py/q3_var_multi_horizon_forecasts_py.csv")
+    write_csv(rmse_h, "output/tables_py/q3_var_rmse_by_horizon_py.csv")
+
+    # Out-of-sample leaderboard: every Q1 candidate x p = 1..8 x trend (shared designs, no refits)
+    leaderboard, grid_paths = var_grid_backtest(
+        y_df,
+        x_df,
+        date_col,
+        y_col,
+        read_top_x_codes_from_q1_csv(q1_csv),
+        max_lag=8,
+        trends=("n", "c", "ct"),
+        train_ratio=0.8,
+        diff_lag=1,
+    )
+    write_csv(leaderboard, "output/tables_py/q3_var_grid_leaderboard_py.csv")
+    write_csv(grid_paths, "output/tables_py/q3_var_grid_forecasts_py.csv")
+
     # Optional consistency check with R (do not hard fail on tiny float diffs)
     r_rmse_path = Path("output/tables/q3_var_rmse.csv")
     if r_rmse_path.exists():
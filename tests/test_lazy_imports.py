@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_python_modules_do_not_import_plotting_or_statsmodels_at_load():
+    code = (
+        "import sys\n"
+        "import python.q1_core, python.q1_io, python.q1_plot\n"
+        "import python.var_core, python.var_io, python.var_plot\n"
+        "heavy = sorted(m for m in ('matplotlib', 'statsmodels') if m in sys.modules)\n"
+        "print(','.join(heavy))\n"
+    )
+    r = subprocess.run([sys.executable, "-c", code], cwd=str(ROOT), capture_output=True, text=True)
+    assert r.returncode == 0, r.stderr
+    assert r.stdout.strip() == ""
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+from python.panel_store import write_panel_store
+from python.q1_core import Q1Config, q1_select_top5
+from python.var_core import prepare_var_level_data
+
+
+def _panels(n=48, k=7, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_vals = np.cumsum(rng.normal(size=n))
+    y_df = pd.DataFrame({"date": dates, "import_clv_qna_sa": y_vals})
+    x_df = pd.DataFrame({"date": dates, **{f"x{j}": 0.3 * j * y_vals + np.cumsum(rng.normal(size=n)) for j in range(k)}})
+    x_df.loc[0, "x2"] = np.nan
+    x_df.loc[n - 1, "x3"] = np.nan
+    return y_df, x_df
+
+
+def test_panel_store_views_are_zero_copy(tmp_path):
+    _, x_df = _panels()
+    store = write_panel_store(x_df.iloc[::-1], tmp_path / "panel")  # unsorted input gets sorted
+
+    assert store.shape == (48, 7)
+    assert np.shares_memory(store["x3"], store.values)
+    assert np.shares_memory(store.view(["x1", "x2"], start="2001-01-01", end="2002-12-31"), store.values)
+    np.testing.assert_array_equal(store["x4"], x_df["x4"].to_numpy())
+    assert store.view(start="2001-01-01", end="2002-12-31").shape == (8, 7)
+
+
+def test_q1_and_var_entry_points_accept_panel_store(tmp_path):
+    y_df, x_df = _panels()
+    blocks = (x_df[["date"] + [f"x{j}" for j in range(s, min(s + 3, 7))]] for s in range(0, 7, 3))
+    store = write_panel_store(blocks, tmp_path / "panel")
+
+    cfg = Q1Config(top_n=4, min_obs=10)
+    pd.testing.assert_frame_equal(q1_select_top5(y_df, store, cfg), q1_select_top5(y_df, x_df, cfg))
+
+    from_store = prepare_var_level_data(y_df, store, "date", "import_clv_qna_sa", "x3")
+    from_frame = prepare_var_level_data(y_df, x_df, "date", "import_clv_qna_sa", "x3")
+    pd.testing.assert_frame_equal(from_store, from_frame)
+
+
+def test_store_path_screens_extra_y_sheet_series_like_dataframe_path(tmp_path):
+    y_df, x_df = _panels()
+    rng = np.random.default_rng(3)
+    y_df["export_clv_qna_sa"] = y_df["import_clv_qna_sa"] + 0.1 * rng.normal(size=len(y_df))
+    y_df["other"] = np.cumsum(rng.normal(size=len(y_df)))
+    store = write_panel_store(x_df, tmp_path / "panel")
+
+    cfg = Q1Config(top_n=5, min_obs=10)
+    full = q1_select_top5(y_df, x_df, cfg)
+    assert full["code"].iloc[0] == "export_clv_qna_sa"
+    pd.testing.assert_frame_equal(q1_select_top5(y_df, store, cfg), full)
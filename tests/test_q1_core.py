@@ -70,3 +70,172 @@ def test_q1_select_top5_returns_expected_column():
     assert top.iloc[0]["code"] == "x1"
 
 
+def test_masked_corr_with_y_matches_pairwise_loop():
+    from python.q1_core import _corr_and_n, masked_corr_with_y
+
+    rng = np.random.default_rng(3)
+    n, k = 40, 12
+    y = rng.normal(size=n)
+    y[[0, 7]] = np.nan
+    x = rng.normal(size=(n, k)) + 0.5 * y[:, None]
+    x[rng.random((n, k)) < 0.2] = np.nan
+    x[:, 3] = 1.0          # zero variance
+    x[:-2, 5] = np.nan     # too few pairs
+
+    corr, n_obs = masked_corr_with_y(y, x)
+    for j in range(k):
+        r_ref, n_ref = _corr_and_n(y, x[:, j])
+        assert n_obs[j] == n_ref
+        if np.isnan(r_ref):
+            assert np.isnan(corr[j])
+        else:
+            assert abs(corr[j] - r_ref) < 1e-12
+
+
+def test_q1_select_top_n_streaming_matches_in_memory(tmp_path):
+    from python.q1_core import q1_select_top_n_streaming
+    from python.q1_io import iter_csv_column_blocks
+
+    rng = np.random.default_rng(7)
+    n, k = 60, 23
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_vals = np.cumsum(rng.normal(size=n))
+    y = pd.DataFrame({"date": dates, "import_clv_qna_sa": y_vals})
+    y.loc[n - 3 :, "import_clv_qna_sa"] = np.nan
+
+    x = pd.DataFrame({"date": dates})
+    for j in range(k):
+        x[f"x{j}"] = (j % 4) * 0.3 * y_vals + np.cumsum(rng.normal(size=n))
+    x["x3"] = y_vals + rng.normal(scale=0.05, size=n)
+    x["x_dup"] = x["x3"]          # exact tie: must stay right after x3
+    x.loc[: n // 2, "x7"] = np.nan  # fewer pairwise obs
+
+    cfg = Q1Config(top_n=6, min_obs=10, train_ratio=0.8, diff_lag=1)
+    full = q1_select_top5(y, x, cfg)
+
+    path = tmp_path / "x.csv"
+    x.to_csv(path, index=False)
+    for kw in ({"chunk_rows": 7}, {"cell_budget": 200}, {}):  # spilled, budget-sized, in memory
+        streamed = q1_select_top_n_streaming(y, iter_csv_column_blocks(path, "date", block_size=4, **kw), cfg)
+        pd.testing.assert_frame_equal(streamed, full)
+    assert list(full["code"][:2]) == ["x3", "x_dup"]
+
+
+def test_lead_lag_corr_fft_matches_shifted_masked_corr():
+    from python.q1_core import lead_lag_corr_fft, masked_corr_with_y
+
+    rng = np.random.default_rng(11)
+    n, k, max_lag = 50, 6, 5
+    y = rng.normal(size=n)
+    x = rng.normal(size=(n, k))
+    x[rng.random((n, k)) < 0.15] = np.nan
+    y[[4, 20]] = np.nan
+    x[:, 2] = 3.0  # zero variance
+
+    corr, n_obs = lead_lag_corr_fft(y, x, max_lag=max_lag)
+    for lag in range(max_lag + 1):
+        r_ref, n_ref = masked_corr_with_y(y[lag:], x[: n - lag])
+        np.testing.assert_array_equal(n_obs[lag], n_ref)
+        np.testing.assert_allclose(corr[lag], r_ref, atol=1e-10, equal_nan=True)
+
+
+def test_q1_select_top_n_lead_lag_finds_leading_series():
+    from python.q1_core import q1_select_top_n_lead_lag
+
+    rng = np.random.default_rng(5)
+    n = 80
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    dx = rng.normal(size=n)
+    dy = np.r_[np.zeros(2), dx[:-2]] + rng.normal(scale=0.2, size=n)  # x leads y by 2
+    y = pd.DataFrame({"date": dates, "import_clv_qna_sa": np.cumsum(dy)})
+    x = pd.DataFrame({"date": dates, "lead2": np.cumsum(dx), "noise": np.cumsum(rng.normal(size=n))})
+
+    cfg = Q1Config(top_n=2, min_obs=10, train_ratio=0.8, diff_lag=1)
+    top = q1_select_top_n_lead_lag(y, x, cfg, max_lag=4)
+
+    assert list(top.columns) == ["code", "lag", "corr", "n_obs", "abs_corr"]
+    assert top.iloc[0]["code"] == "lead2"
+    assert top.iloc[0]["lag"] == 2
+
+
+def test_incremental_screen_matches_full_recompute_per_release(tmp_path):
+    from python.q1_core import q1_screen_rebuild_reason, q1_select_top_n_incremental
+    from python.q1_io import load_q1_screen_state, save_q1_screen_state
+
+    rng = np.random.default_rng(21)
+    n, k = 70, 9
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_vals = np.cumsum(rng.normal(loc=50.0, size=n)) + 1e4
+    y_all = pd.DataFrame({"date": dates, "import_clv_qna_sa": y_vals, "export_clv_qna_sa": 0.5 * y_vals})
+    x_all = pd.DataFrame({"date": dates})
+    for j in range(k):
+        x_all[f"x{j}"] = 0.2 * j * y_vals + np.cumsum(rng.normal(size=n))
+    x_all.loc[rng.random(n) < 0.1, "x4"] = np.nan
+    x_all["flat"] = 2.0
+
+    cfg = Q1Config(top_n=5, min_obs=10, train_ratio=0.8, diff_lag=1)
+    state = None
+    path = tmp_path / "state.npz"
+    for n_rel in range(50, n + 1):
+        if state is not None:
+            state = load_q1_screen_state(path)
+        top, state = q1_select_top_n_incremental(state, y_all.iloc[:n_rel], x_all.iloc[:n_rel], cfg)
+        save_q1_screen_state(state, path)
+
+        full = q1_select_top5(y_all.iloc[:n_rel], x_all.iloc[:n_rel], cfg)
+        assert list(top["code"]) == list(full["code"])
+        assert list(top["n_obs"]) == list(full["n_obs"])
+        np.testing.assert_allclose(top["corr"], full["corr"], rtol=1e-9)
+
+    revised = x_all.copy()
+    revised.loc[0, "date"] = pd.Timestamp("1999-10-01")
+    assert q1_screen_rebuild_reason(state, y_all, revised, cfg) is not None
+    assert q1_screen_rebuild_reason(state, y_all, x_all, cfg) is None
+
+    # historical x revision well inside the old window: only that code is re-summed
+    revised = x_all.copy()
+    revised.loc[5, "x3"] += 100.0
+    assert q1_screen_rebuild_reason(state, y_all, revised, cfg) is None
+    top, new_state = q1_select_top_n_incremental(state, y_all, revised, cfg)
+    full = q1_select_top5(y_all, revised, cfg)
+    assert list(top["code"]) == list(full["code"])
+    np.testing.assert_allclose(top["corr"], full["corr"], rtol=1e-9)
+    np.testing.assert_array_equal(np.delete(new_state.sxy, 3 + 1), np.delete(state.sxy, 3 + 1))
+
+    y_rev = y_all.copy()
+    y_rev.loc[5, "import_clv_qna_sa"] += 100.0
+    assert q1_screen_rebuild_reason(state, y_rev, x_all, cfg) is not None
+
+
+def test_bootstrap_corr_matches_resampled_rows_and_frequency_table():
+    from python.q1_core import (
+        block_bootstrap_indices,
+        bootstrap_corr_with_y,
+        masked_corr_with_y,
+        q1_bootstrap_selection_frequency,
+    )
+
+    rng = np.random.default_rng(2)
+    n, k = 45, 5
+    y = rng.normal(size=n)
+    x = rng.normal(size=(n, k)) + y[:, None] * np.linspace(0.0, 2.0, k)
+    x[rng.random((n, k)) < 0.1] = np.nan
+
+    idx = block_bootstrap_indices(n, 7, 4, np.random.default_rng(0))
+    chunks = list(bootstrap_corr_with_y(y, x, idx, chunk_size=3))
+    corr = np.vstack([c for c, _ in chunks])
+    n_obs = np.vstack([m for _, m in chunks])
+    for r in range(idx.shape[0]):
+        r_ref, n_ref = masked_corr_with_y(y[idx[r]], x[idx[r]])
+        np.testing.assert_array_equal(n_obs[r], n_ref)
+        np.testing.assert_allclose(corr[r], r_ref, atol=1e-10)
+
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_df = pd.DataFrame({"date": dates, "import_clv_qna_sa": np.cumsum(y)})
+    x_df = pd.DataFrame({"date": dates, **{f"x{j}": np.cumsum(np.nan_to_num(x[:, j])) for j in range(k)}})
+    cfg = Q1Config(top_n=2, min_obs=10)
+    freq = q1_bootstrap_selection_frequency(y_df, x_df, cfg, n_boot=200, block_len=3, seed=1, chunk_size=64)
+
+    assert list(freq.columns) == ["code", "selection_freq", "top1_freq"]
+    assert abs(freq["selection_freq"].sum() - 2.0) < 1e-12
+    assert set(freq["code"][:2]) == {"x3", "x4"}
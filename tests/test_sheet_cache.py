@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.sheet_cache import frame_from_npz, frame_to_npz
+from python.var_io import read_x_xlsx
+
+
+def test_frame_npz_roundtrip_keeps_dtypes(tmp_path):
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=3, freq="QS"),
+            "a": [1.0, np.nan, 3.0],
+            "n": [1, 2, 3],
+            "CODE": ["x1", None, "x3"],
+        }
+    )
+    assert frame_to_npz(df, tmp_path / "f.npz")
+    pd.testing.assert_frame_equal(frame_from_npz(tmp_path / "f.npz"), df)
+
+
+def test_read_x_xlsx_cache_hit_and_invalidation(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+
+    x_path = tmp_path / "x.xlsx"
+    cache_dir = tmp_path / "cache"
+    df_x = pd.DataFrame({"date": pd.date_range("2020-01-01", periods=4, freq="QS"), "x1": [1.0, 2.0, 3.0, 4.0]})
+    df_x.to_excel(x_path, sheet_name="data_x", index=False)
+
+    first = read_x_xlsx(str(x_path), cache_dir=str(cache_dir))
+    assert len(list(cache_dir.glob("*.npz"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("workbook parsed although the cache is fresh")
+
+    monkeypatch.setattr(pd, "read_excel", fail)
+    monkeypatch.setattr(pd, "ExcelFile", fail)
+    pd.testing.assert_frame_equal(read_x_xlsx(str(x_path), cache_dir=str(cache_dir)), first)
+    monkeypatch.undo()
+
+    df_x["x1"] = [5.0, 6.0, 7.0, 8.0]
+    df_x.to_excel(x_path, sheet_name="data_x", index=False)
+    second = read_x_xlsx(str(x_path), cache_dir=str(cache_dir))
+    assert second["x1"].tolist() == [5.0, 6.0, 7.0, 8.0]
+    assert len(list(cache_dir.glob("*.npz"))) == 1  # stale entry removed
+
+
+def test_same_stem_workbooks_in_different_folders_keep_their_entries(tmp_path):
+    from python.sheet_cache import read_sheet_cached
+
+    cache_dir = tmp_path / "cache"
+    books = []
+    for folder, value in (("a", 1.0), ("b", 2.0)):
+        path = tmp_path / folder / "x.xlsx"
+        path.parent.mkdir()
+        path.write_bytes(f"workbook {folder}".encode())
+        books.append((path, pd.DataFrame({"v": [value]})))
+
+    for path, df in books:
+        read_sheet_cached(path, "data_x", lambda df=df: df, cache_dir)
+    assert len(list(cache_dir.glob("*.npz"))) == 2
+
+    def fail():
+        raise AssertionError("cache miss")
+
+    for path, df in books:
+        pd.testing.assert_frame_equal(read_sheet_cached(path, "data_x", fail, cache_dir), df)
@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.transforms import transform_block
+
+
+def test_transform_block_kinds_match_pandas():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.uniform(1.0, 5.0, size=(20, 3)), columns=["a", "b", "c"])
+    df.iloc[5, 1] = np.nan
+
+    d4 = transform_block(df.to_numpy(), "diff", lag=4)
+    assert d4.values.shape == (16, 3) and d4.level_index(0) == 4
+    np.testing.assert_allclose(d4.values, df.diff(4).iloc[4:].to_numpy(), equal_nan=True)
+
+    lg = transform_block(df.to_numpy(), "log_diff", lag=1, pad=True)
+    np.testing.assert_allclose(lg.values, np.log(df).diff(1).to_numpy(), equal_nan=True)
+
+    out = np.empty((19, 3))
+    gr = transform_block(df.to_numpy(), "growth", lag=1, out=out)
+    assert gr.values is out
+    np.testing.assert_allclose(out, df.pct_change(fill_method=None).iloc[1:].to_numpy(), equal_nan=True)
+
+
+def test_transform_block_invalid_levels_become_nan():
+    levels = np.array([[1.0, 0.0], [2.0, 3.0], [-1.0, 6.0]])
+    assert np.isnan(transform_block(levels, "log_diff").values[1, 0])
+    assert np.isnan(transform_block(levels, "growth").values[0, 1])
+    with pytest.raises(ValueError):
+        transform_block(levels, "diff", lag=3)
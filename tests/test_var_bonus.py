@@ -1,5 +1,6 @@
 import numpy as np
 import pandas as pd
+import pytest
 from statsmodels.tsa.api import VAR
 
 from python.var_core import compute_orth_irf_table, compute_granger_table
@@ -46,3 +47,86 @@ def test_compute_granger_table_two_directions():
     g = compute_granger_table(res, var_names=["dy", "dx"], kind="f")
     assert set(g.columns) == {"caused", "causing", "kind", "test_stat", "p_value", "df_num", "df_denom"}
     assert len(g) == 2  # dy<-dx and dx<-dy
+
+
+def test_orth_irf_all_orderings_match_refits_on_reordered_columns():
+    from python.var_core import compute_orth_irf_all
+    from python.var_ols import fit_var_ols
+
+    rng = np.random.default_rng(4)
+    train = pd.DataFrame(rng.normal(size=(90, 3)), columns=["a", "b", "c"])
+    fit = fit_var_ols(train, 2, "c")
+    tab = compute_orth_irf_all(fit, steps=6, orderings="all")
+    assert tab["ordering"].nunique() == 6
+    assert len(tab) == 6 * 7 * 9
+
+    for order in [("a", "b", "c"), ("c", "a", "b")]:
+        ref = VAR(train[list(order)]).fit(2, trend="c").irf(6).orth_irfs
+        sub = tab[tab["ordering"] == ",".join(order)]
+        for imp in order:
+            for resp in order:
+                got = sub[(sub["impulse"] == imp) & (sub["response"] == resp)]
+                np.testing.assert_allclose(got["irf"], ref[:, order.index(resp), order.index(imp)], atol=1e-12)
+
+    default = compute_orth_irf_all(fit, steps=6)
+    single = compute_orth_irf_table(fit, "b", "a", steps=6)
+    got = default[(default["impulse"] == "b") & (default["response"] == "a")]
+    np.testing.assert_allclose(got["irf"], single["irf"], atol=1e-12)
+
+
+def test_girf_fevd_table_matches_statsmodels_and_ignores_column_order():
+    from python.var_core import compute_girf_fevd_table
+    from python.var_ols import fit_var_ols
+
+    rng = np.random.default_rng(6)
+    train = pd.DataFrame(rng.normal(size=(90, 3)) @ [[1.0, 0.4, 0.1], [0.0, 1.0, 0.3], [0.0, 0.0, 1.0]], columns=["a", "b", "c"])
+    tab = compute_girf_fevd_table(fit_var_ols(train, 2, "c"), steps=6)
+    assert list(tab.columns) == ["h", "impulse", "response", "girf", "fevd", "fevd_orth"]
+    np.testing.assert_allclose(tab.groupby(["h", "response"])["fevd"].sum(), 1.0)
+
+    res = VAR(train).fit(2, trend="c")
+    fevd = res.fevd(7).decomp  # [response, h, impulse]
+    orth = res.irf(6).orth_irfs
+    names = list(train.columns)
+    for (h, imp, resp), row in tab.set_index(["h", "impulse", "response"]).iterrows():
+        i, j = names.index(resp), names.index(imp)
+        assert row["fevd_orth"] == pytest.approx(fevd[i, h, j], abs=1e-12)
+        if imp == "a":  # the first Cholesky shock is the generalized shock
+            assert row["girf"] == pytest.approx(orth[h, i, j], abs=1e-12)
+
+    # generalized IRF / FEVD do not depend on the column order
+    perm = compute_girf_fevd_table(fit_var_ols(train[["c", "a", "b"]], 2, "c"), steps=6)
+    key = ["h", "impulse", "response"]
+    a = tab.sort_values(key).reset_index(drop=True)
+    b = perm.sort_values(key).reset_index(drop=True)
+    np.testing.assert_allclose(a[["girf", "fevd"]], b[["girf", "fevd"]], atol=1e-10)
+
+
+def test_batched_granger_tables_match_statsmodels_test_causality():
+    from python.q1_core import compute_granger_table as q1_granger
+    from python.var_io import compute_granger_table as io_granger
+    from python.var_ols import fit_var_ols
+
+    rng = np.random.default_rng(2)
+    df = pd.DataFrame(rng.standard_normal((160, 4)), columns=["a", "b", "c", "d"])
+    df["a"] += 0.4 * df["c"].shift(1, fill_value=0.0)
+    res = VAR(df).fit(2)
+    names = list(df.columns)
+
+    for kind in ("f", "wald"):
+        g = compute_granger_table(res, var_names=names, kind=kind, block_exogeneity=True)
+        assert len(g) == 12 + 4
+        for row in g.itertuples():
+            ref = res.test_causality(caused=row.caused, causing=row.causing.split(","), kind=kind)
+            assert row.test_stat == pytest.approx(ref.test_statistic, rel=1e-10)
+            assert row.p_value == pytest.approx(ref.pvalue, rel=1e-10, abs=1e-14)
+            assert row.df_num == (ref.df[0] if kind == "f" else ref.df)
+
+        # same table from the statsmodels-free fit and the q1 copy
+        fast = compute_granger_table(fit_var_ols(df, 2, "c"), var_names=names, kind=kind, block_exogeneity=True)
+        pd.testing.assert_frame_equal(fast, g, rtol=1e-10)
+        pd.testing.assert_frame_equal(q1_granger(res, names, kind=kind), g.iloc[:12], rtol=1e-10)
+
+    w = io_granger(res, names)
+    assert list(w.columns) == ["caused", "causing", "test_statistic", "df", "p_value"]
+    np.testing.assert_allclose(w["p_value"], compute_granger_table(res, names, kind="wald")["p_value"])
@@ -0,0 +1,80 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from python.var_cache import VarFitCache, fit_var_cached, save_var_fit, var_fit_key
+from python.var_core import compute_granger_table, compute_orth_irf_table, extract_var_coef_table
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _train(n=80, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(rng.normal(size=(n, 2)) + 0.1 * rng.normal(size=(n, 2)).cumsum(0), columns=["dy", "dx"])
+
+
+@pytest.mark.parametrize("trend", ["c", "ct"])
+def test_cached_fit_tables_match_statsmodels(tmp_path, trend):
+    from statsmodels.tsa.api import VAR
+
+    train = _train()
+    ref = VAR(train).fit(2, trend=trend)
+    cache = VarFitCache(tmp_path)
+    fit_var_cached(train, 2, trend, cache)
+    hit = fit_var_cached(train, 2, trend, cache)
+
+    pd.testing.assert_frame_equal(extract_var_coef_table(hit), extract_var_coef_table(ref))
+    np.testing.assert_allclose(np.abs(hit.roots), np.abs(ref.roots))
+    pd.testing.assert_frame_equal(
+        compute_orth_irf_table(hit, "dx", "dy", steps=8), compute_orth_irf_table(ref, "dx", "dy", steps=8)
+    )
+    pd.testing.assert_frame_equal(compute_granger_table(hit, ["dy", "dx"]), compute_granger_table(ref, ["dy", "dx"]))
+    assert hit.test_whiteness(12).pvalue == pytest.approx(ref.test_whiteness(12).pvalue, rel=1e-12)
+
+
+def test_fit_key_depends_on_column_order_p_and_trend():
+    train = _train()
+    base = var_fit_key(train, 2, "c")
+    assert var_fit_key(train.copy(), 2, "c") == base
+    assert var_fit_key(train[["dx", "dy"]], 2, "c") != base
+    assert var_fit_key(train, 3, "c") != base
+    assert var_fit_key(train, 2, "ct") != base
+
+
+def test_cache_hit_needs_no_statsmodels_and_lru_evicts_oldest(tmp_path):
+    train = _train()
+    cache = VarFitCache(tmp_path)
+    for p in (1, 2, 3):
+        fit_var_cached(train, p, "c", cache)
+    entries = sorted(tmp_path.glob("*.npz"))
+    assert len(entries) == 3
+
+    code = (
+        "import sys, numpy as np, pandas as pd\n"
+        "from python.var_cache import VarFitCache, fit_var_cached\n"
+        "from python.var_core import compute_granger_table, compute_orth_irf_table, extract_var_coef_table\n"
+        f"res = VarFitCache({str(tmp_path)!r}).get(sys.argv[1])\n"
+        "extract_var_coef_table(res); compute_orth_irf_table(res, 'dx', 'dy'); compute_granger_table(res, ['dy', 'dx'])\n"
+        "print('statsmodels' in sys.modules)\n"
+    )
+    key = var_fit_key(train, 2, "c")
+    r = subprocess.run([sys.executable, "-c", code, key], cwd=str(ROOT), capture_output=True, text=True)
+    assert r.returncode == 0, r.stderr
+    assert r.stdout.strip() == "False"
+
+    # p=1 is the least recently used entry (p=2 was just read); the budget fits all but one entry
+    for age, p in ((300, 1), (200, 3)):
+        path = cache.entry_path(var_fit_key(train, p, "c"))
+        os.utime(path, (path.stat().st_atime - age, path.stat().st_mtime - age))
+    fit4 = fit_var_cached(train, 4, "c")
+    save_var_fit(fit4, tmp_path / "probe" / "p4.npz")
+    budget = sum(e.stat().st_size for e in entries) + (tmp_path / "probe" / "p4.npz").stat().st_size - 1
+    small = VarFitCache(tmp_path, max_bytes=budget)
+    small.put(var_fit_key(train, 4, "c"), fit4)
+    assert not small.entry_path(var_fit_key(train, 1, "c")).exists()
+    assert all(small.entry_path(var_fit_key(train, p, "c")).exists() for p in (2, 3, 4))
@@ -6,6 +6,7 @@ import pytest
 from python.var_core import (
     prepare_var_level_data,
     make_first_differences,
+    make_var_lag_diagnostics,
     recursive_var_one_step_forecast_level,
 )
 
@@ -59,3 +60,333 @@ def test_recursive_forecast_returns_last_20_percent_length():
     )
     assert len(pred) == n - int(np.floor(0.8 * n))
 
+
+def test_prepare_var_level_panel_matches_two_variable_path():
+    from python.var_core import prepare_var_level_panel
+
+    rng = np.random.default_rng(4)
+    n = 30
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_df = pd.DataFrame({"date": dates, "y": np.cumsum(rng.normal(size=n))})
+    y_df.loc[n - 2 :, "y"] = np.nan
+    x_df = pd.DataFrame({"date": dates[::-1], "x": rng.normal(size=n), "z": rng.normal(size=n)})
+    x_df.loc[n - 3 :, "x"] = np.nan  # leading rows (latest->earliest order)
+    x_df.loc[2, "x"] = np.nan        # last kept row
+
+    ref = prepare_var_level_data(y_df, x_df, "date", "y", "x", allow_last_x_missing=True)
+    panel = prepare_var_level_panel(y_df, x_df, "date", "y", ["x"], allow_last_x_missing=True)
+    pd.testing.assert_frame_equal(panel.to_frame("date"), ref)
+
+    multi = prepare_var_level_panel(y_df, x_df, "date", "y", ["x", "z"])
+    assert multi.names == ("y", "x", "z")
+    np.testing.assert_array_equal(multi.column("x"), ref["x"].to_numpy())
+
+
+def test_prepare_var_level_panel_errors_if_any_x_missing_in_middle():
+    from python.var_core import prepare_var_level_panel
+
+    y_df = pd.DataFrame({"date": pd.date_range("2020-01-01", periods=5), "y": [1.0, 2, 3, 4, 5]})
+    x_df = pd.DataFrame(
+        {"date": pd.date_range("2020-01-01", periods=5), "a": [1.0, 2, 3, 4, 5], "b": [10, 11, np.nan, 12, 13]}
+    )
+    with pytest.raises(ValueError, match="not only at the last"):
+        prepare_var_level_panel(y_df, x_df, "date", "y", ["a", "b"])
+
+
+def _simulated_var_diffs(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    e = rng.normal(size=(n, 2))
+    v = np.zeros((n, 2))
+    for t in range(1, n):
+        v[t] = [0.4 * v[t - 1, 0] + 0.2 * v[t - 1, 1], -0.1 * v[t - 1, 0] + 0.3 * v[t - 1, 1]] + e[t]
+    return pd.DataFrame({"dy": v[:, 0], "dx": v[:, 1]})
+
+
+@pytest.mark.parametrize("trend", ["n", "c", "ct"])
+def test_fast_lag_diagnostics_match_statsmodels(trend):
+    train = _simulated_var_diffs()
+    ref = make_var_lag_diagnostics(train, max_lag=6, trend=trend, whiteness_lags=5)
+    fast = make_var_lag_diagnostics(train, max_lag=6, trend=trend, whiteness_lags=5, engine="fast")
+
+    assert list(fast.columns) == list(ref.columns)
+    num = ["aic", "hq", "sc", "fpe", "serial_p_value", "max_root_modulus"]
+    np.testing.assert_allclose(fast[num].to_numpy(), ref[num].to_numpy(), rtol=1e-8, equal_nan=True)
+    assert fast["is_stable"].tolist() == ref["is_stable"].tolist()
+    assert fast["n_significant_terms"].tolist() == ref["n_significant_terms"].tolist()
+
+
+def test_fast_lag_diagnostics_common_sample_uses_same_rows_for_all_p():
+    from statsmodels.tsa.api import VAR
+
+    train = _simulated_var_diffs()
+    fast = make_var_lag_diagnostics(train, max_lag=4, engine="fast", common_sample=True)
+    sel = VAR(train).select_order(maxlags=4, trend="c")
+    np.testing.assert_allclose(fast["aic"], [sel.ics["aic"][p] for p in range(1, 5)], rtol=1e-8)
+
+
+def test_lag_diagnostics_grid_parallel_matches_serial_and_single_runs():
+    from python.var_core import make_var_lag_diagnostics_grid, make_var_train_diffs
+
+    rng = np.random.default_rng(5)
+    n = 60
+    dates = pd.date_range("2000-03-31", periods=n, freq="QE")
+    y_df = pd.DataFrame({"date": dates, "y": np.cumsum(rng.normal(size=n))})
+    x_df = pd.DataFrame({"date": dates, **{f"x{i}": np.cumsum(rng.normal(size=n)) for i in range(3)}})
+    codes = ["x2", "x0", "x1"]
+
+    kw = dict(trends=("n", "c"), max_lag=3, whiteness_lags=5, engine="fast")
+    serial_long, serial_choice = make_var_lag_diagnostics_grid(y_df, x_df, "date", "y", codes, n_jobs=1, **kw)
+    par_long, par_choice = make_var_lag_diagnostics_grid(y_df, x_df, "date", "y", codes, n_jobs=2, **kw)
+
+    pd.testing.assert_frame_equal(serial_long, par_long)
+    pd.testing.assert_frame_equal(serial_choice.drop(columns="seconds"), par_choice.drop(columns="seconds"))
+    assert list(serial_choice[["x_code", "trend"]].itertuples(index=False, name=None)) == [
+        (c, t) for c in codes for t in ("n", "c")
+    ]
+
+    one = make_var_lag_diagnostics(make_var_train_diffs(y_df, x_df, "date", "y", "x0"), max_lag=3, trend="c", whiteness_lags=5)
+    got = serial_long[(serial_long["x_code"] == "x0") & (serial_long["trend"] == "c")].drop(columns=["x_code", "trend"])
+    pd.testing.assert_frame_equal(got.reset_index(drop=True), one, check_exact=False, rtol=1e-8)
+
+
+@pytest.mark.parametrize("p,trend", [(1, "c"), (3, "ct")])
+def test_recursive_forecast_rls_engine_matches_refits(p, trend):
+    rng = np.random.default_rng(7)
+    n = 70
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    kw = dict(level_df=df, date_col="date", y_col="y", x_col="x", p=p, trend=trend)
+    ref = recursive_var_one_step_forecast_level(**kw)
+    rls = recursive_var_one_step_forecast_level(**kw, engine="rls")
+
+    pd.testing.assert_frame_equal(rls[["date", "y_true"]], ref[["date", "y_true"]])
+    np.testing.assert_allclose(rls["y_pred"], ref["y_pred"], rtol=1e-10)
+
+
+def test_recursive_forecast_rolling_window_rls_matches_refits():
+    rng = np.random.default_rng(11)
+    n = 80
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    kw = dict(level_df=df, date_col="date", y_col="y", x_col="x", p=2, trend="ct", window=30)
+    ref = recursive_var_one_step_forecast_level(**kw)
+    rls = recursive_var_one_step_forecast_level(**kw, engine="rls")
+    expanding = recursive_var_one_step_forecast_level(df, "date", "y", "x", p=2, trend="ct")
+
+    assert list(rls.columns) == list(ref.columns) == ["date", "y_true", "y_pred"]
+    np.testing.assert_allclose(rls["y_pred"], ref["y_pred"], rtol=1e-10)
+    assert not np.allclose(ref["y_pred"], expanding["y_pred"])
+
+
+@pytest.mark.parametrize("engine,window", [("statsmodels", None), ("rls", None), ("rls", 30)])
+def test_recursive_forecast_process_pool_matches_serial(engine, window):
+    rng = np.random.default_rng(13)
+    n = 60
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    kw = dict(level_df=df, date_col="date", y_col="y", x_col="x", p=2, engine=engine, window=window)
+    serial = recursive_var_one_step_forecast_level(**kw)
+    pooled = recursive_var_one_step_forecast_level(**kw, n_jobs=3, timing=True)
+
+    pd.testing.assert_frame_equal(pooled[["date", "y_true", "y_pred"]], serial, check_exact=True)
+    assert pooled["seconds"].ge(0).all()
+    assert pooled["worker"].notna().all()
+    if engine == "rls":  # one update chain: always serial
+        assert pooled["worker"].nunique() == 1
+
+
+def test_multi_horizon_forecast_matches_statsmodels_forecast_loop():
+    from statsmodels.tsa.api import VAR
+
+    from python.var_core import recursive_var_multi_horizon_forecast_level
+
+    rng = np.random.default_rng(17)
+    n = 50
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    fc, rmse = recursive_var_multi_horizon_forecast_level(df, "date", "y", "x", p=2, horizon=4, trend="ct")
+
+    t = int(np.floor(0.8 * n))
+    diffs = df[["y", "x"]].diff().iloc[1:t].to_numpy()
+    res = VAR(pd.DataFrame(diffs, columns=["dy", "dx"])).fit(2, trend="ct")
+    expected = df["y"].iloc[t - 1] + np.cumsum(res.forecast(diffs[-2:], steps=4)[:, 0])
+
+    first = fc.iloc[:4]
+    assert first["horizon"].tolist() == [1, 2, 3, 4]
+    assert first["date"].tolist() == [str(d) for d in df["date"].to_numpy()[t : t + 4]]
+    np.testing.assert_allclose(first["y_pred"], expected, rtol=1e-10)
+    assert rmse["horizon"].tolist() == [1, 2, 3, 4]
+    assert rmse["n"].tolist() == [n - t, n - t - 1, n - t - 2, n - t - 3]
+
+
+@pytest.mark.parametrize("engine", ["statsmodels", "rls"])
+def test_multi_horizon_first_step_matches_one_step_backtest_with_window(engine):
+    from python.var_core import recursive_var_multi_horizon_forecast_level
+
+    rng = np.random.default_rng(19)
+    n = 70
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)) + 0.3 * np.arange(n),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    kw = dict(p=2, trend="ct", engine=engine, window=40, train_ratio=0.7)
+    fc, _ = recursive_var_multi_horizon_forecast_level(df, "date", "y", "x", horizon=3, **kw)
+    one = recursive_var_one_step_forecast_level(df, "date", "y", "x", **kw)
+    first = fc[fc["horizon"] == 1].reset_index(drop=True)
+    assert first["date"].tolist() == one["date"].tolist()
+    np.testing.assert_allclose(first["y_pred"], one["y_pred"], rtol=0, atol=1e-8)
+
+
+def test_grid_backtest_cells_match_recursive_backtest():
+    from python.var_core import var_grid_backtest
+
+    rng = np.random.default_rng(19)
+    n = 70
+    dates = pd.date_range("2000-01-01", periods=n, freq="QS")
+    y_df = pd.DataFrame({"date": dates, "y": 100 + np.cumsum(rng.normal(size=n))})
+    x_df = pd.DataFrame({"date": dates, "x0": np.cumsum(rng.normal(size=n)), "x1": np.cumsum(rng.normal(size=n))})
+
+    board, paths = var_grid_backtest(y_df, x_df, "date", "y", ["x0", "x1"], max_lag=3, trends=("n", "ct"))
+    assert len(board) == 2 * 3 * 2
+    assert board["rmse"].is_monotonic_increasing
+    assert board["rank"].tolist() == list(range(1, 13))
+
+    panel = prepare_var_level_data(y_df, x_df, "date", "y", "x1")
+    for trend, p in [("n", 1), ("ct", 3)]:
+        ref = recursive_var_one_step_forecast_level(panel, "date", "y", "x1", p, trend=trend)
+        cell = paths[(paths["x_code"] == "x1") & (paths["trend"] == trend) & (paths["p"] == p)]
+        assert cell["date"].tolist() == ref["date"].tolist()
+        np.testing.assert_allclose(cell["y_pred"], ref["y_pred"], rtol=1e-9)
+
+
+def test_recursive_forecast_bootstrap_intervals_are_seeded_and_nested():
+    from python.var_core import forecast_interval_coverage
+
+    rng = np.random.default_rng(23)
+    n = 80
+    df = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n)),
+            "x": 50 + np.cumsum(rng.normal(size=n)),
+        }
+    )
+    kw = dict(level_df=df, date_col="date", y_col="y", x_col="x", p=1, n_boot=500, seed=3)
+    a = recursive_var_one_step_forecast_level(**kw)
+    b = recursive_var_one_step_forecast_level(**kw, n_jobs=2)
+    point = recursive_var_one_step_forecast_level(df, "date", "y", "x", p=1)
+
+    pd.testing.assert_frame_equal(a, b, check_exact=True)
+    pd.testing.assert_frame_equal(a[["date", "y_true", "y_pred"]], point)
+    assert list(a.columns[3:]) == ["lower_80", "upper_80", "lower_95", "upper_95"]
+    assert (a["lower_95"] <= a["lower_80"]).all() and (a["upper_80"] <= a["upper_95"]).all()
+    assert ((a["lower_80"] < a["y_pred"]) & (a["y_pred"] < a["upper_80"])).all()
+
+    cov = forecast_interval_coverage(a)
+    assert cov["level"].tolist() == [0.8, 0.95]
+    assert cov["n"].tolist() == [len(a), len(a)]
+    assert cov["coverage"].between(0, 1).all()
+
+
+def test_checkpointed_backtest_resumes_and_only_computes_new_folds(tmp_path, monkeypatch):
+    import python.var_core as vc
+    from python.var_cache import FoldCheckpointStore
+
+    rng = np.random.default_rng(29)
+    n = 60
+    full = pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n + 1, freq="QS"),
+            "y": 100 + np.cumsum(rng.normal(size=n + 1)),
+            "x": 50 + np.cumsum(rng.normal(size=n + 1)),
+        }
+    )
+    df = full.iloc[:n]
+    kw = dict(date_col="date", y_col="y", x_col="x", p=2, train_ratio=0.7)
+
+    computed = []
+    real = vc._refit_one_step_dy
+
+    def counting(values, folds, *args, **kwargs):
+        for (t, _), out in zip(folds, real(values, folds, *args, **kwargs)):
+            computed.append(t)
+            yield out
+
+    monkeypatch.setattr(vc, "_refit_one_step_dy", counting)
+    store = FoldCheckpointStore(tmp_path / "folds.jsonl")
+    cold = recursive_var_one_step_forecast_level(df, **kw)
+    n_folds = len(cold)
+
+    # interrupted run: stop after 5 folds, then resume from a fresh handle on the same file
+    computed.clear()
+    for i, _ in enumerate(vc.iter_recursive_var_one_step_forecasts(df, **kw, checkpoint=store)):
+        if i == 4:
+            break
+    resumed = recursive_var_one_step_forecast_level(df, **kw, checkpoint=FoldCheckpointStore(tmp_path / "folds.jsonl"))
+    pd.testing.assert_frame_equal(resumed, cold, check_exact=True)
+    assert len(computed) == n_folds
+
+    # one quarter appended: only the new fold is computed (train_ratio split keeps the old folds here)
+    computed.clear()
+    grown = recursive_var_one_step_forecast_level(full, **kw, checkpoint=FoldCheckpointStore(tmp_path / "folds.jsonl"))
+    assert computed == [n]
+    pd.testing.assert_frame_equal(grown, recursive_var_one_step_forecast_level(full, **kw), check_exact=True)
+
+
+@pytest.mark.parametrize("trend", ["c", "ct"])
+def test_batched_ols_kernel_matches_single_fits(trend):
+    from python.var_ols import fit_var_ols, fit_var_ols_batch, simulate_var_bootstrap
+
+    train = _simulated_var_diffs(n=80, seed=31)
+    fit = fit_var_ols(train, 2, trend)
+    ys = simulate_var_bootstrap(fit.coef, train.to_numpy(), fit.resid, trend, len(train), 5, np.random.default_rng(0))
+    coef, sigma_u = fit_var_ols_batch(ys, 2, trend)
+    for b in range(5):
+        ref = fit_var_ols(pd.DataFrame(ys[b], columns=["dy", "dx"]), 2, trend)
+        np.testing.assert_allclose(coef[b], ref.coef, rtol=1e-10, atol=1e-12)
+        np.testing.assert_allclose(sigma_u[b], ref.sigma_u, rtol=1e-10, atol=1e-12)
+
+
+def test_bootstrap_irf_bands_match_exact_percentiles_and_ignore_n_jobs():
+    from python.var_ols import fit_var_ols
+    import python.var_core as vc
+
+    train = _simulated_var_diffs(n=80, seed=37)
+    fit = fit_var_ols(train, 2, "c")
+    kw = dict(steps=6, orderings="all", n_boot=600, level=0.9, seed=5, chunk_size=150)
+    bands = vc.bootstrap_orth_irf_bands(fit, train, **kw)
+    pd.testing.assert_frame_equal(bands, vc.bootstrap_orth_irf_bands(fit, train, **kw, n_jobs=2), check_exact=True)
+    pd.testing.assert_frame_equal(bands.drop(columns=["lower", "upper"]), vc.compute_orth_irf_all(fit, 6, "all"))
+
+    # same replicate streams: each band is within one histogram bin of the order statistics bracketing its rank
+    state = dict(coef=fit.coef, y_init=train.to_numpy()[:2], resid=fit.resid, trend="c", n_rows=len(train), p=2,
+                 steps=6, orders=[[0, 1], [1, 0]], seed=5)
+    reps = np.sort(np.vstack([vc._irf_boot_values(state, c, 150) for c in range(4)]), axis=0)
+    for col, q in (("lower", 0.05), ("upper", 0.95)):
+        i = int(np.ceil(q * len(reps))) - 1
+        bin_width = 3.0 * (reps[-1] - reps[0]) / 2000
+        assert (bands[col] >= reps[i - 1] - bin_width).all() and (bands[col] <= reps[i + 1] + bin_width).all()
+    assert (bands["lower"] <= bands["upper"]).all()
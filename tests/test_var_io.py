@@ -24,3 +24,44 @@ def test_read_x_xlsx_returns_dataframe_not_dict(tmp_path):
     assert "p_xb_be_oe_base_q" in out.columns
     assert len(out) == 4
 
+
+def test_workbook_session_parses_each_sheet_once(tmp_path, monkeypatch):
+    pytest.importorskip("openpyxl")
+    from python.q1_io import read_desc_sheet_strict, read_y_sheet_strict
+    from python.var_io import read_y_xlsx
+    from python.workbook import WorkbookSession
+
+    y_path = tmp_path / "y.xlsx"
+    dates = pd.date_range("2020-01-01", periods=5, freq="QS")
+    with pd.ExcelWriter(y_path) as w:
+        pd.DataFrame({"date": dates, "import_clv_qna_sa": range(5)}).to_excel(w, sheet_name="data_y", index=False)
+        pd.DataFrame({"CODE": ["a"], "DESCRIPTION": ["A"]}).to_excel(w, sheet_name="descriptions", index=False)
+        pd.DataFrame({"date": dates, "x1": range(5)}).to_excel(w, sheet_name="data_x", index=False)
+
+    opened, parsed = [], []
+    real_excel_file = pd.ExcelFile
+
+    class CountingExcelFile(real_excel_file):
+        def __init__(self, *args, **kwargs):
+            opened.append(1)
+            super().__init__(*args, **kwargs)
+
+        def parse(self, sheet_name=0, *args, **kwargs):
+            parsed.append(sheet_name)
+            return super().parse(sheet_name, *args, **kwargs)
+
+    monkeypatch.setattr(pd, "ExcelFile", CountingExcelFile)
+
+    with WorkbookSession(y_path) as book:
+        y = read_y_sheet_strict(book, "data_y")
+        y_again = read_y_xlsx(book, sheet_name="data_y")
+        desc = read_desc_sheet_strict(book, "descriptions")
+        chunks = list(book.iter_sheet_chunks("data_x", chunk_rows=2))
+        with pytest.raises(ValueError, match="must contain sheet 'nope'"):
+            read_y_sheet_strict(book, "nope")
+
+    assert opened == [1]
+    assert parsed == ["data_y", "descriptions"]
+    assert len(y) == len(y_again) == 5 and list(desc.columns) == ["CODE", "DESCRIPTION"]
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    assert list(chunks[0].columns) == ["date", "x1"]